@@ -1,116 +1,367 @@
 #!/usr/bin/env python3
 """Analyze collected channel data to understand patterns"""
 
+import hashlib
 import json
+import mmap
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# Files at least this large are memory-mapped instead of read into a bytes copy
+_MMAP_THRESHOLD = 64 * 1024
+
+# Column dtypes of the rows produced by extract_channel_row. Ratings fit in 32 bits;
+# fee rates (uint32 ppm in LND), update counts and amounts need 64.
+_ROW_DTYPES = {
+    'channel_id': object,
+    'capacity': np.int64,
+    'local_balance': np.int64,
+    'remote_balance': np.int64,
+    'local_fee_rate': np.int64,
+    'remote_fee_rate': np.int64,
+    'earned_msat': np.int64,
+    'sourced_msat': np.int64,
+    'total_sent_msat': np.int64,
+    'total_received_msat': np.int64,
+    'forwarded_sent_msat': np.int64,
+    'forwarded_received_msat': np.int64,
+    'remote_alias': object,
+    'active': np.bool_,
+    'private': np.bool_,
+    'open_initiator': object,
+    'num_updates': np.int64,
+    'rating': np.int32,
+}
+
+# Bump whenever extract_channel_row or build_channel_frame change what they
+# produce, so frames cached by older code are not reused
+_FRAME_CACHE_VERSION = 2
+
+
+def _parse_json(raw: bytes) -> Any:
+    """Parse raw JSON bytes, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 def load_channel_data(data_dir: Path) -> List[Dict[str, Any]]:
     """Load all channel detail files"""
-    channels = []
-    channel_files = data_dir.glob("channels/*_details.json")
+    return [data for data in _map_channel_files(_load_channel_file, data_dir)
+            if data is not None]
+
+def load_channel_rows(data_dir: Path) -> List[Dict[str, Any]]:
+    """Load channel detail files, keeping only the fields used by the analysis.
+    
+    Each document is reduced to its analysis row as soon as it is parsed, so the
+    full JSON tree of every channel is never held in memory at the same time.
+    """
+    return [row for row in _map_channel_files(_load_channel_row, data_dir)
+            if row is not None]
+
+def load_channel_frame(data_dir: Path) -> pd.DataFrame:
+    """Load the analysis DataFrame, reusing a cached copy while the files are unchanged.
+    
+    The cache lives in data_dir/.cache and is keyed by the frame schema
+    (_FRAME_CACHE_VERSION and _ROW_DTYPES) plus the name, size and mtime of
+    every channel detail file, so a schema change or any added, removed or
+    rewritten file triggers a fresh ingest. The cache is Parquet and needs
+    pyarrow; without it every call ingests the files directly.
+    """
+    if not PYARROW_AVAILABLE:
+        return build_channel_frame(load_channel_rows(data_dir))
+    
+    files = _channel_files(data_dir)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"v{_FRAME_CACHE_VERSION}\0{_ROW_DTYPES!r}\n".encode())
+    for file in sorted(files):
+        st = os.stat(file)
+        digest.update(f"{os.path.basename(file)}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
     
-    for file in channel_files:
-        with open(file, 'r') as f:
-            try:
-                data = json.load(f)
-                channels.append(data)
-            except Exception as e:
-                print(f"Error loading {file}: {e}")
+    cache_dir = data_dir / ".cache"
+    cache_file = cache_dir / f"channels_{digest.hexdigest()}.parquet"
+    if cache_file.exists():
+        try:
+            return pd.read_parquet(cache_file, engine="pyarrow")
+        except Exception as e:
+            print(f"Ignoring unreadable cache {cache_file}: {e}")
+    
+    df = build_channel_frame(load_channel_rows(data_dir))
+    try:
+        cache_dir.mkdir(exist_ok=True)
+        # Also clears caches left by older versions, including pickles
+        for stale in cache_dir.glob("channels_*"):
+            stale.unlink()
+        df.to_parquet(cache_file, engine="pyarrow", index=False)
+    except OSError as e:
+        print(f"Could not write cache {cache_file}: {e}")
+    
+    return df
+
+def _map_channel_files(func: Callable[[str], Any], data_dir: Path) -> List[Any]:
+    """Apply func to every channel detail file, overlapping file I/O across threads"""
+    files = _channel_files(data_dir)
+    if len(files) < 2:
+        return [func(file) for file in files]
     
-    return channels
+    workers = min(32, (os.cpu_count() or 1) * 4, len(files))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, files))
+
+def _channel_files(data_dir: Path) -> List[str]:
+    """List channel detail file paths"""
+    channels_dir = data_dir / "channels"
+    if not channels_dir.is_dir():
+        return []
+    
+    # os.scandir avoids building a Path object (and stat call) per directory entry
+    with os.scandir(channels_dir) as entries:
+        return [entry.path for entry in entries
+                if entry.name.endswith("_details.json") and entry.is_file()]
+
+def _load_channel_file(file: str) -> Any:
+    """Parse a single channel detail file, returning None on failure"""
+    try:
+        with open(file, 'rb') as f:
+            if ORJSON_AVAILABLE and os.fstat(f.fileno()).st_size >= _MMAP_THRESHOLD:
+                # orjson parses straight from the mapped pages without a bytes copy
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        return orjson.loads(view)
+            return _parse_json(f.read())
+    except (OSError, ValueError) as e:
+        # orjson.JSONDecodeError and json.JSONDecodeError both subclass ValueError
+        print(f"Error loading {file}: {e}")
+        return None
+
+def _load_channel_row(file: str) -> Optional[Dict[str, Any]]:
+    """Parse a single channel detail file straight into its analysis row"""
+    data = _load_channel_file(file)
+    if data is None:
+        return None
+    return extract_channel_row(data)
+
+# Shared stand-in for missing sub-documents; never mutated
+_EMPTY: Dict[str, Any] = {}
+
+def _as_int(value: Any, default: int = 0) -> int:
+    """Coerce a numeric JSON field to int, treating null like a missing field"""
+    return default if value is None else int(value)
+
+def extract_channel_row(ch: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the raw analysis fields from a channel details document"""
+    # Look each sub-document up once instead of once per field
+    balance = ch.get('balance') or _EMPTY
+    policies = ch.get('policies') or _EMPTY
+    local_policy = policies.get('local') or _EMPTY
+    remote_policy = policies.get('remote') or _EMPTY
+    fee_report = ch.get('feeReport') or _EMPTY
+    flow_report = ch.get('flowReport') or _EMPTY
+    status = ch.get('status') or _EMPTY
+    rating = ch.get('rating') or _EMPTY
+    
+    return {
+        'channel_id': ch.get('channelIdCompact', ''),
+        'capacity': _as_int(ch.get('capacitySat')),
+        'local_balance': _as_int(balance.get('localBalanceSat')),
+        'remote_balance': _as_int(balance.get('remoteBalanceSat')),
+        'local_fee_rate': _as_int(local_policy.get('feeRatePpm')),
+        'remote_fee_rate': _as_int(remote_policy.get('feeRatePpm')),
+        'earned_msat': _as_int(fee_report.get('earnedMilliSat')),
+        'sourced_msat': _as_int(fee_report.get('sourcedMilliSat')),
+        'total_sent_msat': _as_int(flow_report.get('totalSentMilliSat')),
+        'total_received_msat': _as_int(flow_report.get('totalReceivedMilliSat')),
+        'forwarded_sent_msat': _as_int(flow_report.get('forwardedSentMilliSat')),
+        'forwarded_received_msat': _as_int(flow_report.get('forwardedReceivedMilliSat')),
+        'remote_alias': ch.get('remoteAlias', 'Unknown'),
+        'active': status.get('active', False),
+        'private': status.get('private', False),
+        'open_initiator': ch.get('openInitiator', ''),
+        'num_updates': _as_int(ch.get('numUpdates')),
+        'rating': _as_int(rating.get('rating'), -1),
+    }
 
 def analyze_channels(channels: List[Dict[str, Any]]) -> pd.DataFrame:
     """Convert channel data to DataFrame for analysis"""
-    rows = []
-    
-    for ch in channels:
-        row = {
-            'channel_id': ch.get('channelIdCompact', ''),
-            'capacity': int(ch.get('capacitySat', 0)),
-            'local_balance': int(ch.get('balance', {}).get('localBalanceSat', 0)),
-            'remote_balance': int(ch.get('balance', {}).get('remoteBalanceSat', 0)),
-            'local_fee_rate': ch.get('policies', {}).get('local', {}).get('feeRatePpm', 0),
-            'remote_fee_rate': ch.get('policies', {}).get('remote', {}).get('feeRatePpm', 0),
-            'earned_msat': int(ch.get('feeReport', {}).get('earnedMilliSat', 0)),
-            'sourced_msat': int(ch.get('feeReport', {}).get('sourcedMilliSat', 0)),
-            'total_sent_msat': int(ch.get('flowReport', {}).get('totalSentMilliSat', 0)),
-            'total_received_msat': int(ch.get('flowReport', {}).get('totalReceivedMilliSat', 0)),
-            'forwarded_sent_msat': int(ch.get('flowReport', {}).get('forwardedSentMilliSat', 0)),
-            'forwarded_received_msat': int(ch.get('flowReport', {}).get('forwardedReceivedMilliSat', 0)),
-            'remote_alias': ch.get('remoteAlias', 'Unknown'),
-            'active': ch.get('status', {}).get('active', False),
-            'private': ch.get('status', {}).get('private', False),
-            'open_initiator': ch.get('openInitiator', ''),
-            'num_updates': int(ch.get('numUpdates', 0)),
-            'rating': ch.get('rating', {}).get('rating', -1),
-        }
-        
-        # Calculate derived metrics
-        row['balance_ratio'] = row['local_balance'] / row['capacity'] if row['capacity'] > 0 else 0.5
-        row['total_flow_sats'] = (row['total_sent_msat'] + row['total_received_msat']) / 1000
-        row['net_flow_sats'] = (row['total_received_msat'] - row['total_sent_msat']) / 1000
-        row['total_fees_sats'] = (row['earned_msat'] + row['sourced_msat']) / 1000
-        row['fee_per_flow'] = row['total_fees_sats'] / row['total_flow_sats'] if row['total_flow_sats'] > 0 else 0
-        
-        rows.append(row)
-    
-    return pd.DataFrame(rows)
+    return build_channel_frame([extract_channel_row(ch) for ch in channels])
+
+def build_channel_frame(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Build the analysis DataFrame from extracted channel rows.
+    
+    Rows are transposed into one typed NumPy array per column, so pandas does not
+    have to infer dtypes row by row and numeric values are never boxed.
+    """
+    n = len(rows)
+    columns = {}
+    for name, dtype in _ROW_DTYPES.items():
+        if dtype is object:
+            columns[name] = np.array([row[name] for row in rows], dtype=object)
+        else:
+            columns[name] = np.fromiter((row[name] for row in rows), dtype=dtype, count=n)
+    
+    columns.update(_derive_metrics(
+        columns['capacity'], columns['local_balance'],
+        columns['total_sent_msat'], columns['total_received_msat'],
+        columns['earned_msat'], columns['sourced_msat'],
+    ))
+    
+    return pd.DataFrame(columns, copy=False)
+
+def _derive_metrics(capacity: np.ndarray, local_balance: np.ndarray,
+                    sent_msat: np.ndarray, received_msat: np.ndarray,
+                    earned_msat: np.ndarray, sourced_msat: np.ndarray) -> Dict[str, np.ndarray]:
+    """Compute the derived per-channel metric columns.
+    
+    Each output is allocated once and then scaled in place, so the block makes no
+    intermediate temporaries beyond the masks for the guarded divisions.
+    """
+    n = capacity.shape[0]
+    
+    # A ratio in [0, 1] needs no more than float32 precision
+    balance_ratio = np.full(n, 0.5, dtype=np.float32)
+    np.divide(local_balance, capacity, out=balance_ratio, where=capacity > 0)
+    
+    # Summing in float64 is exact for msat amounts (< 2**53) and skips an int64 temporary
+    total_flow_sats = np.add(sent_msat, received_msat, dtype=np.float64)
+    total_flow_sats /= 1000
+    net_flow_sats = np.subtract(received_msat, sent_msat, dtype=np.float64)
+    net_flow_sats /= 1000
+    total_fees_sats = np.add(earned_msat, sourced_msat, dtype=np.float64)
+    total_fees_sats /= 1000
+    
+    fee_per_flow = np.zeros(n)
+    np.divide(total_fees_sats, total_flow_sats, out=fee_per_flow, where=total_flow_sats > 0)
+    
+    return {
+        'balance_ratio': balance_ratio,
+        'total_flow_sats': total_flow_sats,
+        'net_flow_sats': net_flow_sats,
+        'total_fees_sats': total_fees_sats,
+        'fee_per_flow': fee_per_flow,
+    }
+
+def _top_k(df: pd.DataFrame, column: str, k: int = 10) -> pd.DataFrame:
+    """Rows with the k largest values of column, same rows and order as DataFrame.nlargest"""
+    values = df[column].to_numpy()
+    if len(values) <= k:
+        # Taking every row is a plain stable sort (NaN last)
+        return df.iloc[np.argsort(-values, kind='stable')]
+    
+    # NaN rows only fill in when there are fewer than k other rows
+    if values.dtype.kind == 'f':
+        missing = np.isnan(values)
+        valid = np.flatnonzero(~missing)
+        values = values[valid]
+    else:
+        missing = None
+        valid = np.arange(len(values))
+    
+    if len(values) > k:
+        # Partial partition is O(n) to find the k-th largest value; take every row
+        # above it, then fill from the rows tied with it in index order (keep='first')
+        kth = np.partition(values, len(values) - k)[len(values) - k]
+        above = np.flatnonzero(values > kth)
+        tied = np.flatnonzero(values == kth)[:k - len(above)]
+        idx = np.sort(np.concatenate([above, tied]))
+    else:
+        idx = np.arange(len(values))
+    # Stable sort keeps tied rows in index order
+    positions = valid[idx[np.argsort(-values[idx], kind='stable')]]
+    if missing is not None and len(positions) < k:
+        positions = np.concatenate([positions, np.flatnonzero(missing)[:k - len(positions)]])
+    return df.iloc[positions]
 
 def print_analysis(df: pd.DataFrame):
     """Print detailed analysis of channels"""
     print("=== Channel Network Analysis ===\n")
     
+    flow = df['total_flow_sats'].to_numpy()
+    balance_ratio = df['balance_ratio'].to_numpy()
+    
+    # Summary statistics computed in one batched aggregation instead of a call per value
+    stats = df.agg({
+        'capacity': ['sum', 'mean'],
+        'local_balance': ['sum'],
+        'remote_balance': ['sum'],
+        'local_fee_rate': ['mean', 'median', 'min', 'max'],
+        'total_fees_sats': ['sum'],
+        'total_flow_sats': ['sum'],
+    })
+    
     # Overall statistics
     print(f"Total Channels: {len(df)}")
-    print(f"Total Capacity: {df['capacity'].sum():,} sats")
-    print(f"Average Channel Size: {df['capacity'].mean():,.0f} sats")
-    print(f"Total Local Balance: {df['local_balance'].sum():,} sats")
-    print(f"Total Remote Balance: {df['remote_balance'].sum():,} sats")
+    print(f"Total Capacity: {int(stats.at['sum', 'capacity']):,} sats")
+    print(f"Average Channel Size: {stats.at['mean', 'capacity']:,.0f} sats")
+    print(f"Total Local Balance: {int(stats.at['sum', 'local_balance']):,} sats")
+    print(f"Total Remote Balance: {int(stats.at['sum', 'remote_balance']):,} sats")
     
     # Fee statistics
     print(f"\n=== Fee Statistics ===")
-    print(f"Average Local Fee Rate: {df['local_fee_rate'].mean():.0f} ppm")
-    print(f"Median Local Fee Rate: {df['local_fee_rate'].median():.0f} ppm")
-    print(f"Fee Rate Range: {df['local_fee_rate'].min()} - {df['local_fee_rate'].max()} ppm")
-    print(f"Total Fees Earned: {df['total_fees_sats'].sum():,.0f} sats")
+    print(f"Average Local Fee Rate: {stats.at['mean', 'local_fee_rate']:.0f} ppm")
+    print(f"Median Local Fee Rate: {stats.at['median', 'local_fee_rate']:.0f} ppm")
+    print(f"Fee Rate Range: {int(stats.at['min', 'local_fee_rate'])} - {int(stats.at['max', 'local_fee_rate'])} ppm")
+    print(f"Total Fees Earned: {stats.at['sum', 'total_fees_sats']:,.0f} sats")
     
-    # Flow statistics
+    # Flow statistics (counts come from the column arrays, no filtered DataFrame copies)
     print(f"\n=== Flow Statistics ===")
-    active_channels = df[df['total_flow_sats'] > 0]
-    print(f"Active Channels: {len(active_channels)} ({len(active_channels)/len(df)*100:.1f}%)")
-    print(f"Total Flow: {df['total_flow_sats'].sum():,.0f} sats")
-    print(f"Average Flow per Active Channel: {active_channels['total_flow_sats'].mean():,.0f} sats")
+    total_flow = stats.at['sum', 'total_flow_sats']
+    active_count = int(np.count_nonzero(flow > 0))
+    # Inactive channels contribute zero flow, so the active mean is total / active count
+    avg_active_flow = total_flow / active_count if active_count else float('nan')
+    print(f"Active Channels: {active_count} ({active_count/len(df)*100:.1f}%)")
+    print(f"Total Flow: {total_flow:,.0f} sats")
+    print(f"Average Flow per Active Channel: {avg_active_flow:,.0f} sats")
     
     # Balance distribution
     print(f"\n=== Balance Distribution ===")
-    balanced = df[(df['balance_ratio'] > 0.3) & (df['balance_ratio'] < 0.7)]
-    depleted = df[df['balance_ratio'] < 0.1]
-    full = df[df['balance_ratio'] > 0.9]
-    print(f"Balanced (30-70%): {len(balanced)} channels")
-    print(f"Depleted (<10%): {len(depleted)} channels")
-    print(f"Full (>90%): {len(full)} channels")
+    balanced = np.count_nonzero((balance_ratio > 0.3) & (balance_ratio < 0.7))
+    depleted = np.count_nonzero(balance_ratio < 0.1)
+    full = np.count_nonzero(balance_ratio > 0.9)
+    print(f"Balanced (30-70%): {balanced} channels")
+    print(f"Depleted (<10%): {depleted} channels")
+    print(f"Full (>90%): {full} channels")
     
     # Top performers
     print(f"\n=== Top 10 Fee Earners ===")
-    top_earners = df.nlargest(10, 'total_fees_sats')[['channel_id', 'remote_alias', 'capacity', 'total_fees_sats', 'local_fee_rate', 'balance_ratio']]
+    top_earners = _top_k(df, 'total_fees_sats')[['channel_id', 'remote_alias', 'capacity', 'total_fees_sats', 'local_fee_rate', 'balance_ratio']]
     print(top_earners.to_string(index=False))
     
     # High flow channels
     print(f"\n=== Top 10 High Flow Channels ===")
-    high_flow = df.nlargest(10, 'total_flow_sats')[['channel_id', 'remote_alias', 'total_flow_sats', 'total_fees_sats', 'local_fee_rate']]
+    high_flow = _top_k(df, 'total_flow_sats')[['channel_id', 'remote_alias', 'total_flow_sats', 'total_fees_sats', 'local_fee_rate']]
     print(high_flow.to_string(index=False))
     
     # Correlation analysis
     print(f"\n=== Correlation Analysis ===")
+    fee_rate = df['local_fee_rate'].to_numpy()
+    capacity = df['capacity'].to_numpy()
+    # One correlation matrix over all the columns instead of a Series.corr per pair
+    matrix = np.vstack([fee_rate, df['total_fees_sats'].to_numpy(), flow, capacity, balance_ratio])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = np.corrcoef(matrix)
     correlations = {
-        'Fee Rate vs Earnings': df['local_fee_rate'].corr(df['total_fees_sats']),
-        'Flow vs Earnings': df['total_flow_sats'].corr(df['total_fees_sats']),
-        'Capacity vs Flow': df['capacity'].corr(df['total_flow_sats']),
-        'Balance Ratio vs Flow': df['balance_ratio'].corr(df['total_flow_sats']),
+        'Fee Rate vs Earnings': corr[0, 1],
+        'Flow vs Earnings': corr[2, 1],
+        'Capacity vs Flow': corr[3, 2],
+        'Balance Ratio vs Flow': corr[4, 2],
     }
     for metric, corr in correlations.items():
         print(f"{metric}: {corr:.3f}")
@@ -119,30 +370,38 @@ def print_analysis(df: pd.DataFrame):
     print(f"\n=== Optimization Opportunities ===")
     
     # High flow, low fee channels
-    high_flow_low_fee = df[(df['total_flow_sats'] > df['total_flow_sats'].quantile(0.75)) & 
-                           (df['local_fee_rate'] < df['local_fee_rate'].median())]
-    print(f"\nHigh Flow + Low Fees ({len(high_flow_low_fee)} channels):")
-    if len(high_flow_low_fee) > 0:
-        print(high_flow_low_fee[['channel_id', 'remote_alias', 'total_flow_sats', 'local_fee_rate', 'total_fees_sats']].head())
+    high_flow_low_fee = (flow > np.quantile(flow, 0.75)) & (fee_rate < stats.at['median', 'local_fee_rate'])
+    count = np.count_nonzero(high_flow_low_fee)
+    print(f"\nHigh Flow + Low Fees ({count} channels):")
+    if count > 0:
+        rows = np.flatnonzero(high_flow_low_fee)[:5]
+        print(df.iloc[rows][['channel_id', 'remote_alias', 'total_flow_sats', 'local_fee_rate', 'total_fees_sats']])
     
     # Imbalanced high-value channels
-    imbalanced = df[((df['balance_ratio'] < 0.2) | (df['balance_ratio'] > 0.8)) & 
-                    (df['capacity'] > df['capacity'].median())]
-    print(f"\nImbalanced High-Capacity Channels ({len(imbalanced)} channels):")
-    if len(imbalanced) > 0:
-        print(imbalanced[['channel_id', 'remote_alias', 'capacity', 'balance_ratio', 'net_flow_sats']].head())
+    imbalanced = ((balance_ratio < 0.2) | (balance_ratio > 0.8)) & (capacity > np.median(capacity))
+    count = np.count_nonzero(imbalanced)
+    print(f"\nImbalanced High-Capacity Channels ({count} channels):")
+    if count > 0:
+        rows = np.flatnonzero(imbalanced)[:5]
+        print(df.iloc[rows][['channel_id', 'remote_alias', 'capacity', 'balance_ratio', 'net_flow_sats']])
+
+def write_channel_csv(df: pd.DataFrame, path: str):
+    """Write the analysis table as CSV, using pyarrow's native writer when installed"""
+    if PYARROW_AVAILABLE:
+        pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+    else:
+        df.to_csv(path, index=False)
 
 if __name__ == "__main__":
     data_dir = Path("data_samples")
     
     print("Loading channel data...")
-    channels = load_channel_data(data_dir)
+    df = load_channel_frame(data_dir)
     
-    print(f"Loaded {len(channels)} channels\n")
+    print(f"Loaded {len(df)} channels\n")
     
-    df = analyze_channels(channels)
     print_analysis(df)
     
     # Save processed data
-    df.to_csv("channel_analysis.csv", index=False)
+    write_channel_csv(df, "channel_analysis.csv")
     print(f"\nAnalysis saved to channel_analysis.csv")
\ No newline at end of file
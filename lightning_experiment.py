@@ -2,11 +2,13 @@
 """Lightning Fee Optimization Experiment - CLI Tool"""
 
 import asyncio
+import heapq
 import logging
 import json
+import signal
 import sys
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 import click
 from tabulate import tabulate
 import time
@@ -14,8 +16,9 @@ import time
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from src.experiment.controller import ExperimentController, ExperimentPhase, ParameterSet, ChannelSegment
+from src.experiment.controller import ExperimentController, ExperimentPhase, ParameterSet, ChannelSegment, change_epoch, is_rollback
 from src.experiment.lnd_integration import LNDRestClient, ExperimentLNDIntegration
+from src.utils.aio import run_async
 from src.utils.config import Config
 
 
@@ -32,6 +35,25 @@ def setup_logging(verbose: bool = False):
     )
 
 
+# Tables with more rows than this skip tabulate's grid layout
+FAST_TABLE_THRESHOLD = 50
+
+
+def print_table(table_data, headers):
+    """Print a table: grid layout for small tables, a plain aligned layout for large ones"""
+    if len(table_data) <= FAST_TABLE_THRESHOLD:
+        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+        return
+    
+    rows = [[str(cell) for cell in row] for row in table_data]
+    # Measure every column once, then format all rows with one template
+    widths = [max(map(len, column)) for column in zip(headers, *rows)]
+    template = "  ".join(f"{{:<{width}}}" for width in widths)
+    lines = [template.format(*headers), template.format(*("-" * width for width in widths))]
+    lines.extend(template.format(*row) for row in rows)
+    print("\n".join(lines))
+
+
 class CLIExperimentRunner:
     """Simple CLI experiment runner"""
     
@@ -46,6 +68,13 @@ class CLIExperimentRunner:
         # LND integration for actual fee changes
         self.lnd_integration = None
         self.running = False
+        self._stop_event = None
+    
+    def stop(self):
+        """Stop the continuous run loop, waking it if it is waiting for the next cycle"""
+        self.running = False
+        if self._stop_event is not None:
+            self._stop_event.set()
     
     async def initialize_lnd_integration(self, macaroon_path: str = None, cert_path: str = None):
         """Initialize LND REST client for fee changes"""
@@ -90,27 +119,24 @@ class CLIExperimentRunner:
     
     def print_status(self):
         """Print current experiment status"""
-        current_time = datetime.utcnow()
+        now = time.time()
+        current_time = datetime.utcfromtimestamp(now)
         if self.controller.experiment_start:
             elapsed_hours = (current_time - self.controller.experiment_start).total_seconds() / 3600
         else:
             elapsed_hours = 0
         
-        # Recent activity count
+        # Recent activity count, in a single pass over the change history
+        cutoff = now - 24 * 3600
         recent_changes = 0
         recent_rollbacks = 0
         
         for exp_channel in self.controller.experiment_channels.values():
-            recent_changes += len([
-                change for change in exp_channel.change_history
-                if (current_time - datetime.fromisoformat(change['timestamp'])).total_seconds() < 24 * 3600
-            ])
-            
-            recent_rollbacks += len([
-                change for change in exp_channel.change_history
-                if (current_time - datetime.fromisoformat(change['timestamp'])).total_seconds() < 24 * 3600
-                and 'ROLLBACK' in change['reason']
-            ])
+            for change in exp_channel.change_history:
+                if change_epoch(change) > cutoff:
+                    recent_changes += 1
+                    if is_rollback(change):
+                        recent_rollbacks += 1
         
         print(f"\n=== EXPERIMENT STATUS ===")
         print(f"Current Phase: {self.controller.current_phase.value.title()}")
@@ -144,18 +170,16 @@ class CLIExperimentRunner:
         table_data = []
         headers = ["Channel ID", "Group", "Tier", "Activity", "Current Fee", "Changes", "Status"]
         
+        # Channels rolled back in the last 24h, found in one scan before building rows
+        cutoff = time.time() - 24 * 3600
+        rolled_back = {
+            channel_id for channel_id, exp_channel in channels.items()
+            if any(is_rollback(change) and change_epoch(change) > cutoff
+                   for change in exp_channel.change_history)
+        }
+        
         for channel_id, exp_channel in channels.items():
-            status = "Active"
-            
-            # Check for recent rollbacks
-            recent_rollbacks = [
-                change for change in exp_channel.change_history
-                if 'ROLLBACK' in change['reason'] and
-                   (datetime.utcnow() - datetime.fromisoformat(change['timestamp'])).total_seconds() < 24 * 3600
-            ]
-            
-            if recent_rollbacks:
-                status = "Rolled Back"
+            status = "Rolled Back" if channel_id in rolled_back else "Active"
             
             table_data.append([
                 channel_id[:16] + "...",
@@ -168,7 +192,7 @@ class CLIExperimentRunner:
             ])
         
         if table_data:
-            print(tabulate(table_data, headers=headers, tablefmt="grid"))
+            print_table(table_data, headers)
         else:
             print("No channels found.")
         print()
@@ -180,15 +204,15 @@ class CLIExperimentRunner:
             print("No experiment data available.")
             return
             
-        performance_data = {}
-        
-        # Get performance by parameter set
-        for param_set in ParameterSet:
-            perf = self.controller.db.get_parameter_set_performance(
-                self.controller.experiment_id, param_set.value
-            )
-            if perf:
-                performance_data[param_set.value] = perf
+        # Get performance for all parameter sets in one query, in enum order
+        perf_by_set = self.controller.db.get_all_parameter_set_performance(
+            self.controller.experiment_id
+        )
+        performance_data = {
+            param_set.value: perf_by_set[param_set.value]
+            for param_set in ParameterSet
+            if param_set.value in perf_by_set
+        }
         
         print("\n=== PERFORMANCE SUMMARY ===")
         
@@ -224,23 +248,14 @@ class CLIExperimentRunner:
     
     def print_recent_changes(self, hours: int = 24):
         """Print recent fee changes"""
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-        
-        recent_changes = []
+        cutoff = time.time() - hours * 3600
         
-        for channel_id, exp_channel in self.controller.experiment_channels.items():
-            for change in exp_channel.change_history:
-                change_time = datetime.fromisoformat(change['timestamp'])
-                if change_time > cutoff_time:
-                    recent_changes.append({
-                        'timestamp': change_time,
-                        'channel_id': channel_id,
-                        'segment': exp_channel.segment.value,
-                        **change
-                    })
-        
-        # Sort by timestamp
-        recent_changes.sort(key=lambda x: x['timestamp'], reverse=True)
+        recent_changes = [
+            (change_epoch(change), channel_id, exp_channel.segment.value, change)
+            for channel_id, exp_channel in self.controller.experiment_channels.items()
+            for change in exp_channel.change_history
+            if change_epoch(change) > cutoff
+        ]
         
         print(f"\n=== RECENT CHANGES (Last {hours}h) ===")
         
@@ -251,24 +266,25 @@ class CLIExperimentRunner:
         table_data = []
         headers = ["Time", "Channel", "Group", "Old Fee", "New Fee", "Reason"]
         
-        for change in recent_changes[:20]:  # Show last 20 changes
-            is_rollback = 'ROLLBACK' in change['reason']
+        # Show last 20 changes, newest first, without sorting the whole window
+        latest = heapq.nlargest(20, recent_changes, key=lambda item: item[0])
+        for ts, channel_id, segment, change in latest:
             old_fee = change.get('old_fee', 'N/A')
             new_fee = change.get('new_fee', 'N/A')
             reason = change['reason'][:50] + "..." if len(change['reason']) > 50 else change['reason']
             
-            status_indicator = "ROLLBACK" if is_rollback else "UPDATE"
+            status_indicator = "ROLLBACK" if is_rollback(change) else "UPDATE"
             
             table_data.append([
-                change['timestamp'].strftime('%H:%M:%S'),
-                change['channel_id'][:12] + "...",
-                change['group'],
+                datetime.utcfromtimestamp(ts).strftime('%H:%M:%S'),
+                channel_id[:12] + "...",
+                segment,
                 f"{old_fee} ppm",
                 f"{new_fee} ppm {status_indicator}",
                 reason
             ])
         
-        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+        print_table(table_data, headers)
         print()
     
     async def run_single_cycle(self, dry_run: bool = False):
@@ -372,7 +388,10 @@ def init(ctx, duration, macaroon_path, cert_path, dry_run):
             print("Running in DRY-RUN mode (no actual fee changes)")
         
         print("Analyzing channels and assigning segments...")
-        success = await runner.controller.initialize_experiment(duration)
+        try:
+            success = await runner.controller.initialize_experiment(duration)
+        finally:
+            await runner.controller.aclose()
         
         if success:
             print("✓ Experiment initialized successfully")
@@ -380,7 +399,7 @@ def init(ctx, duration, macaroon_path, cert_path, dry_run):
         else:
             print("✗ Failed to initialize experiment")
     
-    asyncio.run(_init())
+    run_async(_init())
 
 
 @cli.command()
@@ -457,9 +476,12 @@ def cycle(ctx, dry_run, macaroon_path, cert_path):
                 print("Use --dry-run to simulate")
                 return
         
-        await runner.run_single_cycle(dry_run)
+        try:
+            await runner.run_single_cycle(dry_run)
+        finally:
+            await runner.controller.aclose()
     
-    asyncio.run(_cycle())
+    run_async(_cycle())
 
 
 @cli.command()
@@ -492,6 +514,15 @@ def run(ctx, interval, max_cycles, dry_run, macaroon_path, cert_path):
         
         cycle_count = 0
         runner.running = True
+        runner._stop_event = asyncio.Event()
+        
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, runner.stop)
+            except (NotImplementedError, RuntimeError):
+                # Signal handlers are unavailable (e.g. on Windows); rely on KeyboardInterrupt
+                pass
         
         try:
             while runner.running:
@@ -510,19 +541,25 @@ def run(ctx, interval, max_cycles, dry_run, macaroon_path, cert_path):
                 
                 print(f"⏳ Waiting {interval} minutes until next cycle...")
                 
-                # Wait with ability to interrupt
-                for i in range(interval * 60):
-                    if not runner.running:
-                        break
-                    await asyncio.sleep(1)
+                # Sleep until the next cycle, waking immediately if stopped
+                try:
+                    await asyncio.wait_for(runner._stop_event.wait(), timeout=interval * 60)
+                except asyncio.TimeoutError:
+                    pass
+            
+            if runner._stop_event.is_set():
+                print("\nExperiment stopped by user")
                     
         except KeyboardInterrupt:
             print("\nExperiment stopped by user")
+        finally:
+            # Cycles share one LND Manage client; release its connections
+            await runner.controller.aclose()
         
         print("Generating final report...")
         runner.save_report()
     
-    asyncio.run(_run())
+    run_async(_run())
 
 
 @cli.command()
@@ -15,24 +15,127 @@ Key improvements over charge-lnd:
 """
 
 import asyncio
+import itertools
 import logging
+import logging.handlers
+import signal
 import sys
+import time
 import json
 import os
 from pathlib import Path
 from datetime import datetime
 import click
-from tabulate import tabulate
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Load environment variables from .env file
 load_dotenv()
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from src.policy.manager import PolicyManager
-from src.policy.engine import create_sample_config
+from src.utils.aio import run_async
+
+# Daemon progress messages; buffered and flushed once per pass (see daemon_output)
+daemon_log = logging.getLogger('lightning_policy.daemon')
+
+# PolicyManager (httpx, grpc, numpy) and tabulate are imported where they are
+# needed so that --help and generate-config start without them
+
+
+async def execute_rollbacks(manager, actions, macaroon_path: str, cert_path: str):
+    """Execute rollbacks over the manager's persistent gRPC client, falling back to REST"""
+    grpc_client = manager.get_grpc_client(macaroon_path, cert_path)
+    if grpc_client is not None:
+        return await manager.execute_rollbacks(actions, grpc_client)
+
+    from src.experiment.lnd_integration import LNDRestClient
+    async with LNDRestClient(
+        lnd_rest_url=manager.lnd_rest_url,
+        cert_path=cert_path,
+        macaroon_path=macaroon_path
+    ) as lnd_rest:
+        return await manager.execute_rollbacks(actions, lnd_rest)
+
+
+def dump_json(data) -> bytes:
+    """Encode data as indented JSON, using orjson's native encoder when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str)
+    return json.dumps(data, indent=2, default=str).encode()
+
+
+# Default daemon channel cache TTL as a multiple of the interval: entries fetched
+# on one pass are still valid when the next starts (even if a pass is slow), and
+# expire before the one after
+CHANNEL_CACHE_INTERVAL_FACTOR = 1.5
+
+
+def grid_table(rows, headers) -> str:
+    """Render rows (any iterable, e.g. a generator) as a grid table
+
+    One tabulate call over every row, so column widths and alignment are
+    consistent across the whole table.
+    """
+    from tabulate import tabulate
+
+    return tabulate(rows, headers=headers, tablefmt="grid")
+
+
+def print_grid_table(rows, headers) -> None:
+    """Print a grid table"""
+    print(grid_table(rows, headers))
+
+
+def format_last_applied(last_applied, fmt: str) -> str:
+    """Format a policy's last_applied epoch (UTC) for display"""
+    if last_applied is None or last_applied == 'Never':
+        return 'Never'
+    if isinstance(last_applied, str):
+        # Reports written before last_applied became an epoch stored ISO strings
+        return datetime.fromisoformat(last_applied).strftime(fmt)
+    return time.strftime(fmt, time.gmtime(last_applied))
+
+
+def run_with_manager(manager, coro):
+    """Run a command coroutine, closing the manager's shared sessions on the same loop"""
+    async def _main():
+        try:
+            return await coro
+        finally:
+            await manager.close()
+    return run_async(_main())
+
+
+class BatchedStdoutHandler(logging.handlers.MemoryHandler):
+    """Buffer log records and write them to stdout in a single write per flush()"""
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self.buffer:
+                sys.stdout.write(''.join(self.format(record) + '\n' for record in self.buffer))
+                sys.stdout.flush()
+                self.buffer.clear()
+        finally:
+            self.release()
+
+
+def daemon_output() -> BatchedStdoutHandler:
+    """Route daemon_log to stdout through a buffer that is written out once per pass"""
+    # Only errors force an early write; everything else waits for flush()
+    handler = BatchedStdoutHandler(capacity=1000, flushLevel=logging.ERROR)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    daemon_log.handlers[:] = [handler]
+    daemon_log.setLevel(logging.INFO)
+    daemon_log.propagate = False
+    return handler
 
 
 def setup_logging(verbose: bool = False):
@@ -65,6 +168,8 @@ def cli(ctx, verbose, lnd_manage_url, lnd_rest_url, lnd_grpc_host, lnd_dir, pref
     
     # Only initialize manager if config is provided
     if config:
+        from src.policy.manager import PolicyManager
+
         ctx.obj['manager'] = PolicyManager(
             config_file=config,
             lnd_manage_url=lnd_manage_url,
@@ -73,6 +178,8 @@ def cli(ctx, verbose, lnd_manage_url, lnd_rest_url, lnd_grpc_host, lnd_dir, pref
             lnd_dir=lnd_dir,
             prefer_grpc=prefer_grpc
         )
+        # The manager caches one gRPC channel for the whole command
+        ctx.call_on_close(ctx.obj['manager'].close_grpc_client)
     
     ctx.obj['verbose'] = verbose
     ctx.obj['lnd_manage_url'] = lnd_manage_url
@@ -123,33 +230,31 @@ def apply(ctx, dry_run, macaroon_path, cert_path):
         # Show policy matches
         if results['policy_matches']:
             print(f"\n=== POLICY MATCHES (Top 10) ===")
-            matches_table = []
-            for channel_id, policies in list(results['policy_matches'].items())[:10]:
-                matches_table.append([
-                    channel_id[:16] + "...",
-                    ', '.join(policies)
-                ])
+            matches_rows = (
+                [channel_id[:16] + "...", ', '.join(policies)]
+                for channel_id, policies in itertools.islice(results['policy_matches'].items(), 10)
+            )
             
-            print(tabulate(matches_table, headers=["Channel", "Matched Policies"], tablefmt="grid"))
+            print_grid_table(matches_rows, headers=["Channel", "Matched Policies"])
         
         # Show performance summary
         perf_summary = results['performance_summary']
         if perf_summary.get('policy_performance'):
             print(f"\n=== POLICY PERFORMANCE ===")
-            perf_table = []
-            for policy in perf_summary['policy_performance']:
-                perf_table.append([
+            perf_rows = (
+                [
                     policy['name'],
                     policy['applied_count'],
                     policy['strategy'],
                     f"{policy['avg_revenue_impact']:.0f} msat"
-                ])
+                ]
+                for policy in perf_summary['policy_performance']
+            )
             
-            print(tabulate(perf_table, 
-                         headers=["Policy", "Applied", "Strategy", "Avg Revenue Impact"], 
-                         tablefmt="grid"))
+            print_grid_table(perf_rows,
+                             headers=["Policy", "Applied", "Strategy", "Avg Revenue Impact"])
     
-    asyncio.run(_apply())
+    run_with_manager(manager, _apply())
 
 
 @cli.command()
@@ -176,23 +281,18 @@ def status(ctx):
     if perf_report.get('policy_performance'):
         print(f"\n=== ACTIVE POLICY PERFORMANCE ===")
         
-        perf_table = []
-        for policy in perf_report['policy_performance']:
-            last_applied = policy.get('last_applied', 'Never')
-            if last_applied != 'Never':
-                last_applied = datetime.fromisoformat(last_applied).strftime('%m/%d %H:%M')
-            
-            perf_table.append([
-                policy['name'],
-                policy['applied_count'],
-                policy['strategy'],
-                f"{policy['avg_revenue_impact']:.0f}",
-                last_applied
-            ])
+        def perf_rows():
+            for policy in perf_report['policy_performance']:
+                yield [
+                    policy['name'],
+                    policy['applied_count'],
+                    policy['strategy'],
+                    f"{policy['avg_revenue_impact']:.0f}",
+                    format_last_applied(policy.get('last_applied'), '%m/%d %H:%M')
+                ]
         
-        print(tabulate(perf_table,
-                     headers=["Policy", "Applied", "Strategy", "Avg Revenue", "Last Applied"],
-                     tablefmt="grid"))
+        print_grid_table(perf_rows(),
+                         headers=["Policy", "Applied", "Strategy", "Avg Revenue", "Last Applied"])
 
 
 @cli.command()
@@ -217,51 +317,41 @@ def rollback(ctx, execute, macaroon_path, cert_path):
         
         # Show rollback candidates
         print(f"\n=== ROLLBACK CANDIDATES ===")
-        rollback_table = []
-        
-        for action in rollback_info['actions']:
-            rollback_table.append([
+        rollback_rows = (
+            [
                 action['channel_id'][:16] + "...",
                 f"{action['revenue_decline']:.1%}",
                 f"{action['threshold']:.1%}",
                 f"{action['old_outbound']} → {action['new_outbound']}",
                 f"{action['old_inbound']} → {action['new_inbound']}",
                 ', '.join(action['policies'])
-            ])
+            ]
+            for action in rollback_info['actions']
+        )
         
-        print(tabulate(rollback_table,
-                     headers=["Channel", "Decline", "Threshold", "Outbound Change", "Inbound Change", "Policies"],
-                     tablefmt="grid"))
+        print_grid_table(rollback_rows,
+                         headers=["Channel", "Decline", "Threshold", "Outbound Change", "Inbound Change", "Policies"])
         
         if execute:
             print(f"\nExecuting {len(rollback_info['actions'])} rollbacks...")
             
-            # Initialize LND connection
-            from src.experiment.lnd_integration import LNDRestClient
-            async with LNDRestClient(
-                lnd_rest_url=manager.lnd_rest_url,
-                cert_path=cert_path,
-                macaroon_path=macaroon_path
-            ) as lnd_rest:
-                
-                rollback_results = await manager.execute_rollbacks(
-                    rollback_info['actions'], 
-                    lnd_rest
-                )
-                
-                print(f"✓ Rollbacks completed:")
-                print(f"  Attempted: {rollback_results['rollbacks_attempted']}")
-                print(f"  Successful: {rollback_results['rollbacks_successful']}")
-                print(f"  Errors: {len(rollback_results['errors'])}")
-                
-                if rollback_results['errors']:
-                    print(f"\n=== ROLLBACK ERRORS ===")
-                    for error in rollback_results['errors']:
-                        print(f"• {error}")
+            rollback_results = await execute_rollbacks(
+                manager, rollback_info['actions'], macaroon_path, cert_path
+            )
+            
+            print(f"✓ Rollbacks completed:")
+            print(f"  Attempted: {rollback_results['rollbacks_attempted']}")
+            print(f"  Successful: {rollback_results['rollbacks_successful']}")
+            print(f"  Errors: {len(rollback_results['errors'])}")
+            
+            if rollback_results['errors']:
+                print(f"\n=== ROLLBACK ERRORS ===")
+                for error in rollback_results['errors']:
+                    print(f"• {error}")
         else:
             print(f"\nDRY-RUN: Use --execute to actually perform rollbacks")
     
-    asyncio.run(_rollback())
+    run_with_manager(manager, _rollback())
 
 
 @cli.command()
@@ -288,12 +378,15 @@ def report(ctx, output, output_format):
             'policy_performance': perf_report['policy_performance']
         }
         
+        encoded = dump_json(report_data)
         if output:
-            with open(output, 'w') as f:
-                json.dump(report_data, f, indent=2)
+            with open(output, 'wb') as f:
+                f.write(encoded)
             print(f"✓ JSON report saved to {output}")
         else:
-            print(json.dumps(report_data, indent=2))
+            sys.stdout.flush()
+            sys.stdout.buffer.write(encoded + b"\n")
+            sys.stdout.flush()
     
     elif output_format == 'table':
         print("=== POLICY PERFORMANCE REPORT ===")
@@ -301,35 +394,28 @@ def report(ctx, output, output_format):
         print(f"Session: {status_info['session_id']}")
         print(f"Active Policies: {status_info['active_rules']}/{status_info['total_rules']}")
         
-        if perf_report.get('policy_performance'):
-            print(f"\n=== DETAILED POLICY PERFORMANCE ===")
-            
-            detailed_table = []
-            for policy in perf_report['policy_performance']:
-                last_applied = policy.get('last_applied', 'Never')
-                if last_applied != 'Never':
-                    last_applied = datetime.fromisoformat(last_applied).strftime('%Y-%m-%d %H:%M')
-                
-                detailed_table.append([
+        detailed_headers = ["Policy Name", "Strategy", "Times Applied", "Avg Revenue Impact", "Last Applied"]
+        
+        def detailed_rows():
+            for policy in perf_report.get('policy_performance', []):
+                yield [
                     policy['name'],
                     policy['strategy'],
                     policy['applied_count'],
                     f"{policy['avg_revenue_impact']:+.0f} msat",
-                    last_applied
-                ])
-            
-            print(tabulate(detailed_table,
-                         headers=["Policy Name", "Strategy", "Times Applied", "Avg Revenue Impact", "Last Applied"],
-                         tablefmt="grid"))
+                    format_last_applied(policy.get('last_applied'), '%Y-%m-%d %H:%M')
+                ]
+        
+        if perf_report.get('policy_performance'):
+            print(f"\n=== DETAILED POLICY PERFORMANCE ===")
+            print_grid_table(detailed_rows(), headers=detailed_headers)
         
         if output:
             # Save table format to file
             with open(output, 'w') as f:
                 f.write("Policy Performance Report\n")
                 f.write(f"Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                f.write(tabulate(detailed_table,
-                               headers=["Policy Name", "Strategy", "Times Applied", "Avg Revenue Impact", "Last Applied"],
-                               tablefmt="grid"))
+                f.write(grid_table(detailed_rows(), headers=detailed_headers))
             print(f"✓ Report saved to {output}")
 
 
@@ -339,10 +425,9 @@ def report(ctx, output, output_format):
 def generate_config(ctx, output_file):
     """Generate a sample configuration file with advanced features"""
     
-    sample_config = create_sample_config()
+    from src.policy.engine import SAMPLE_CONFIG_BYTES
     
-    with open(output_file, 'w') as f:
-        f.write(sample_config)
+    Path(output_file).write_bytes(SAMPLE_CONFIG_BYTES)
     
     print(f"✓ Sample configuration generated: {output_file}")
     print()
@@ -361,10 +446,14 @@ def generate_config(ctx, output_file):
 @cli.command()
 @click.option('--watch', is_flag=True, help='Watch mode - apply policies every 10 minutes')
 @click.option('--interval', default=10, help='Minutes between policy applications in watch mode')
+@click.option('--rollback-interval', default=60, help='Seconds between rollback checks in watch mode')
+@click.option('--channel-cache-ttl', type=float, default=None,
+              help='Seconds to reuse fetched channel data between passes (default: 1.5x the interval, '
+                   'so channels are refetched every other pass; 0 disables the cache)')
 @click.option('--macaroon-path', default=os.getenv('LND_MACAROON_PATH', '/root/.lnd/data/chain/bitcoin/mainnet/admin.macaroon'), help='Path to admin.macaroon file')
 @click.option('--cert-path', default=os.getenv('LND_CERT_PATH', '/root/.lnd/tls.cert'), help='Path to tls.cert file')
 @click.pass_context
-def daemon(ctx, watch, interval, macaroon_path, cert_path):
+def daemon(ctx, watch, interval, rollback_interval, channel_cache_ttl, macaroon_path, cert_path):
     """Run policy manager in daemon mode with automatic rollbacks"""
     manager = ctx.obj['manager']
     
@@ -372,65 +461,99 @@ def daemon(ctx, watch, interval, macaroon_path, cert_path):
         print("Use --watch to enable daemon mode")
         return
     
+    # Reuse channel data across passes: the cache has to outlive one interval to
+    # ever hit, so by default a channel's balances and flow stats may be up to one
+    # pass (about one interval) old when rules are matched. Channels whose fees the
+    # daemon changes or rolls back are always refetched.
+    if channel_cache_ttl is None:
+        channel_cache_ttl = interval * 60 * CHANNEL_CACHE_INTERVAL_FACTOR
+    manager.channel_cache_ttl = channel_cache_ttl
+    
+    output = daemon_output()
+    
     async def _daemon():
-        print(f"🤖 Starting policy daemon (interval: {interval} minutes)")
-        print("Press Ctrl+C to stop")
+        daemon_log.info(f"🤖 Starting policy daemon (interval: {interval} minutes, "
+              f"rollback checks every {rollback_interval} seconds)")
+        daemon_log.info("Press Ctrl+C to stop")
+        output.flush()
         
-        cycle_count = 0
+        stop_event = asyncio.Event()
+        # Serializes fee writes so a rollback never races an apply pass
+        fee_lock = asyncio.Lock()
         
-        try:
-            while True:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop_event.set)
+            except (NotImplementedError, RuntimeError):
+                # Signal handlers are unavailable (e.g. on Windows); rely on KeyboardInterrupt
+                pass
+        
+        async def _wait(seconds: float) -> None:
+            # Sleep, waking immediately if stopped
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=seconds)
+            except asyncio.TimeoutError:
+                pass
+        
+        async def _apply_loop():
+            cycle_count = 0
+            while not stop_event.is_set():
                 cycle_count += 1
-                print(f"\n--- Cycle {cycle_count} at {datetime.utcnow().strftime('%H:%M:%S')} ---")
+                daemon_log.info(f"\n--- Cycle {cycle_count} at {datetime.utcnow().strftime('%H:%M:%S')} ---")
                 
-                # Apply policies
+                # Apply policies, picking up config edits without a restart
                 try:
-                    results = await manager.apply_policies(
-                        dry_run=False,
-                        macaroon_path=macaroon_path,
-                        cert_path=cert_path
-                    )
+                    manager.reload_policies_if_changed()
+                    async with fee_lock:
+                        results = await manager.apply_policies(
+                            dry_run=False,
+                            macaroon_path=macaroon_path,
+                            cert_path=cert_path
+                        )
                     
-                    print(f"Applied {results['fee_changes']} fee changes")
+                    daemon_log.info(f"Applied {results['fee_changes']} fee changes")
                     
                     if results['errors']:
-                        print(f"WARNING: {len(results['errors'])} errors occurred")
+                        daemon_log.warning(f"WARNING: {len(results['errors'])} errors occurred")
                 
                 except Exception as e:
-                    print(f"❌ Policy application failed: {e}")
+                    daemon_log.error(f"❌ Policy application failed: {e}")
                 
-                # Check rollbacks
+                # Wait for next cycle
+                daemon_log.info(f"💤 Sleeping for {interval} minutes...")
+                output.flush()
+                await _wait(interval * 60)
+        
+        async def _rollback_loop():
+            while not stop_event.is_set():
                 try:
                     rollback_info = await manager.check_rollback_conditions()
                     
                     if rollback_info['rollback_candidates'] > 0:
-                        print(f"🔙 Found {rollback_info['rollback_candidates']} rollback candidates")
+                        daemon_log.info(f"🔙 Found {rollback_info['rollback_candidates']} rollback candidates")
                         
-                        from src.experiment.lnd_integration import LNDRestClient
-                        async with LNDRestClient(
-                            lnd_rest_url=manager.lnd_rest_url,
-                            cert_path=cert_path,
-                            macaroon_path=macaroon_path
-                        ) as lnd_rest:
-                            
-                            rollback_results = await manager.execute_rollbacks(
-                                rollback_info['actions'],
-                                lnd_rest
+                        async with fee_lock:
+                            rollback_results = await execute_rollbacks(
+                                manager, rollback_info['actions'], macaroon_path, cert_path
                             )
-                            
-                            print(f"Executed {rollback_results['rollbacks_successful']} rollbacks")
+                        
+                        daemon_log.info(f"Executed {rollback_results['rollbacks_successful']} rollbacks")
                 
                 except Exception as e:
-                    print(f"❌ Rollback check failed: {e}")
+                    daemon_log.error(f"❌ Rollback check failed: {e}")
                 
-                # Wait for next cycle
-                print(f"💤 Sleeping for {interval} minutes...")
-                await asyncio.sleep(interval * 60)
+                output.flush()
+                await _wait(rollback_interval)
         
+        try:
+            await asyncio.gather(_apply_loop(), _rollback_loop())
         except KeyboardInterrupt:
-            print("\n🛑 Daemon stopped by user")
+            pass
+        daemon_log.info("\n🛑 Daemon stopped by user")
+        output.flush()
     
-    asyncio.run(_daemon())
+    run_with_manager(manager, _daemon())
 
 
 @cli.command()
@@ -444,64 +567,63 @@ def test_channel(ctx, channel_id, verbose):
     async def _test():
         print(f"Testing policy evaluation for channel: {channel_id}")
         
-        # Get channel data
-        from src.api.client import LndManageClient
-        async with LndManageClient(manager.lnd_manage_url) as lnd_manage:
-            try:
-                channel_details = await lnd_manage.get_channel_details(channel_id)
-                enriched_data = await manager._enrich_channel_data(channel_details, lnd_manage)
-                
-                print(f"\n=== CHANNEL INFO ===")
-                print(f"Capacity: {enriched_data['capacity']:,} sats")
-                print(f"Balance Ratio: {enriched_data['local_balance_ratio']:.2%}")
-                print(f"Activity Level: {enriched_data['activity_level']}")
-                print(f"Current Outbound Fee: {enriched_data['current_outbound_fee']} ppm")
-                print(f"Current Inbound Fee: {enriched_data['current_inbound_fee']} ppm")
-                print(f"7d Flow: {enriched_data['flow_7d']:,} msat")
-                
-                # Test policy matching
-                matching_rules = manager.policy_engine.match_channel(enriched_data)
-                
-                print(f"\n=== POLICY MATCHES ===")
-                if not matching_rules:
-                    print("No policies matched this channel")
-                    return
-                
-                for i, rule in enumerate(matching_rules):
-                    print(f"{i+1}. {rule.name} (priority: {rule.priority})")
-                    print(f"   Strategy: {rule.policy.strategy.value}")
-                    print(f"   Type: {rule.policy.policy_type.value}")
-                    
-                    if verbose:
-                        print(f"   Applied {rule.applied_count} times")
-                        if rule.last_applied:
-                            print(f"   Last applied: {rule.last_applied.strftime('%Y-%m-%d %H:%M')}")
-                
-                # Calculate recommended fees
-                outbound_fee, outbound_base, inbound_fee, inbound_base = \
-                    manager.policy_engine.calculate_fees(enriched_data)
-                
-                print(f"\n=== RECOMMENDED FEES ===")
-                print(f"Outbound Fee: {outbound_fee} ppm (base: {outbound_base} msat)")
-                print(f"Inbound Fee: {inbound_fee:+} ppm (base: {inbound_base:+} msat)")
-                
-                # Show changes
-                current_out = enriched_data['current_outbound_fee']
-                current_in = enriched_data['current_inbound_fee']
+        # Get channel data over the manager's shared session
+        lnd_manage = await manager.get_lnd_manage_client()
+        try:
+            channel_details = await lnd_manage.get_channel_details(channel_id)
+            enriched_data = await manager._enrich_channel_data(channel_details, lnd_manage)
+            
+            print(f"\n=== CHANNEL INFO ===")
+            print(f"Capacity: {enriched_data['capacity']:,} sats")
+            print(f"Balance Ratio: {enriched_data['local_balance_ratio']:.2%}")
+            print(f"Activity Level: {enriched_data['activity_level']}")
+            print(f"Current Outbound Fee: {enriched_data['current_outbound_fee']} ppm")
+            print(f"Current Inbound Fee: {enriched_data['current_inbound_fee']} ppm")
+            print(f"7d Flow: {enriched_data['flow_7d']:,} msat")
+            
+            # Test policy matching
+            matching_rules = manager.policy_engine.match_channel(enriched_data)
+            
+            print(f"\n=== POLICY MATCHES ===")
+            if not matching_rules:
+                print("No policies matched this channel")
+                return
+            
+            for i, rule in enumerate(matching_rules):
+                print(f"{i+1}. {rule.name} (priority: {rule.priority})")
+                print(f"   Strategy: {rule.policy.strategy.value}")
+                print(f"   Type: {rule.policy.policy_type.value}")
                 
-                if outbound_fee != current_out or inbound_fee != current_in:
-                    print(f"\n=== CHANGES ===")
-                    if outbound_fee != current_out:
-                        print(f"Outbound: {current_out} → {outbound_fee} ppm ({outbound_fee - current_out:+} ppm)")
-                    if inbound_fee != current_in:
-                        print(f"Inbound: {current_in:+} → {inbound_fee:+} ppm ({inbound_fee - current_in:+} ppm)")
-                else:
-                    print(f"\n✓ No fee changes recommended")
+                if verbose:
+                    print(f"   Applied {rule.applied_count} times")
+                    if rule.last_applied:
+                        print(f"   Last applied: {rule.last_applied.strftime('%Y-%m-%d %H:%M')}")
             
-            except Exception as e:
-                print(f"❌ Error testing channel: {e}")
-    
-    asyncio.run(_test())
+            # Calculate recommended fees
+            outbound_fee, outbound_base, inbound_fee, inbound_base = \
+                manager.policy_engine.calculate_fees(enriched_data)
+            
+            print(f"\n=== RECOMMENDED FEES ===")
+            print(f"Outbound Fee: {outbound_fee} ppm (base: {outbound_base} msat)")
+            print(f"Inbound Fee: {inbound_fee:+} ppm (base: {inbound_base:+} msat)")
+            
+            # Show changes
+            current_out = enriched_data['current_outbound_fee']
+            current_in = enriched_data['current_inbound_fee']
+            
+            if outbound_fee != current_out or inbound_fee != current_in:
+                print(f"\n=== CHANGES ===")
+                if outbound_fee != current_out:
+                    print(f"Outbound: {current_out} → {outbound_fee} ppm ({outbound_fee - current_out:+} ppm)")
+                if inbound_fee != current_in:
+                    print(f"Inbound: {current_in:+} → {inbound_fee:+} ppm ({inbound_fee - current_in:+} ppm)")
+            else:
+                print(f"\n✓ No fee changes recommended")
+        
+        except Exception as e:
+            print(f"❌ Error testing channel: {e}")
+
+    run_with_manager(manager, _test())
 
 
 if __name__ == "__main__":
@@ -6,24 +6,45 @@ import logging
 import signal
 import sys
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime, time, timezone
 import click
 from rich.console import Console
 from rich.live import Live
 from rich.table import Table
 from rich.panel import Panel
+from rich.text import Text
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from src.experiment.controller import ExperimentController, ExperimentPhase
+from src.experiment.controller import ExperimentController, PHASE_BY_PARAMETER_SET
+from src.utils.aio import run_async
 from src.utils.config import Config
 
 console = Console()
 logger = logging.getLogger(__name__)
 
 
+def _json_default(obj):
+    """json.dump fallback matching orjson's report output (naive datetimes as UTC, NumPy as lists)"""
+    if isinstance(obj, datetime):
+        if obj.tzinfo is None:
+            obj = obj.replace(tzinfo=timezone.utc)
+        return obj.isoformat()
+    if isinstance(obj, (date, time)):
+        return obj.isoformat()
+    if hasattr(obj, 'tolist'):  # NumPy arrays and scalars
+        return obj.tolist()
+    return str(obj)
+
+
 class ExperimentRunner:
     """Main experiment runner with monitoring and control"""
     
@@ -37,6 +58,16 @@ class ExperimentRunner:
         self.running = False
         self.cycle_count = 0
         
+        # (start hour, duration) of each phase; fixed once the parameter set durations are
+        self._phase_windows = {}
+        start_hours = 0
+        for param_set, duration in self.controller.PARAMETER_SET_DURATION_HOURS.items():
+            self._phase_windows[PHASE_BY_PARAMETER_SET[param_set]] = (start_hours, duration)
+            start_hours += duration
+        
+        self._setup_panel = None
+        self._build_status_display()
+        
         # Setup logging
         logging.basicConfig(
             level=logging.INFO,
@@ -48,6 +79,8 @@ class ExperimentRunner:
         )
         
         # Handle interrupts gracefully
+        self._loop = None
+        self._stop_event = None
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
     
@@ -55,6 +88,16 @@ class ExperimentRunner:
         """Handle shutdown signals"""
         console.print("\n[yellow]Received shutdown signal. Stopping experiment safely...[/yellow]")
         self.running = False
+        # Wake the main loop if it is waiting for the next collection
+        if self._loop is not None and self._stop_event is not None:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
+    
+    async def _wait(self, seconds: float) -> None:
+        """Sleep for up to seconds, returning early once a shutdown signal arrives"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
     
     async def run_experiment(self, duration_days: int = 7, collection_interval: int = 30):
         """Run the complete experiment"""
@@ -64,62 +107,80 @@ class ExperimentRunner:
         console.print(f"Data collection interval: {collection_interval} minutes")
         console.print("")
         
-        # Initialize experiment
-        console.print("[cyan]Initializing experiment...[/cyan]")
+        # The controller keeps one LND Manage client open across cycles; close it
+        # however the run ends
         try:
-            success = await self.controller.initialize_experiment(duration_days)
-            if not success:
-                console.print("[red]❌ Failed to initialize experiment[/red]")
+            # Initialize experiment
+            console.print("[cyan]Initializing experiment...[/cyan]")
+            try:
+                success = await self.controller.initialize_experiment(duration_days)
+                if not success:
+                    console.print("[red]❌ Failed to initialize experiment[/red]")
+                    return
+            except Exception as e:
+                console.print(f"[red]❌ Initialization failed: {e}[/red]")
                 return
-        except Exception as e:
-            console.print(f"[red]❌ Initialization failed: {e}[/red]")
-            return
-        
-        console.print("[green]Experiment initialized successfully[/green]")
         
-        # Display experiment setup
-        self._display_experiment_setup()
+            console.print("[green]Experiment initialized successfully[/green]")
         
-        # Start monitoring loop
-        self.running = True
+            # Display experiment setup
+            self._display_experiment_setup()
         
-        with Live(self._create_status_display(), refresh_per_second=0.2) as live:
-            while self.running:
+            # Start monitoring loop
+            self.running = True
+            self._loop = asyncio.get_running_loop()
+            self._stop_event = asyncio.Event()
+            for sig in (signal.SIGINT, signal.SIGTERM):
                 try:
-                    # Run experiment cycle
-                    should_continue = await self.controller.run_experiment_cycle()
+                    self._loop.add_signal_handler(sig, self._signal_handler, sig, None)
+                except (NotImplementedError, RuntimeError):
+                    # Signal handlers are unavailable (e.g. on Windows); keep signal.signal
+                    pass
+        
+            with Live(self._update_status_display(), refresh_per_second=0.2) as live:
+                while self.running:
+                    try:
+                        # Run experiment cycle
+                        should_continue = await self.controller.run_experiment_cycle()
                     
-                    if not should_continue:
-                        console.print("\n[green]Experiment completed successfully![/green]")
-                        break
+                        if not should_continue:
+                            console.print("\n[green]Experiment completed successfully![/green]")
+                            break
                     
-                    self.cycle_count += 1
+                        self.cycle_count += 1
                     
-                    # Update live display
-                    live.update(self._create_status_display())
+                        # Update live display
+                        live.update(self._update_status_display())
                     
-                    # Wait for next collection
-                    await asyncio.sleep(collection_interval * 60)
+                        # Wait for next collection, waking immediately on shutdown
+                        await self._wait(collection_interval * 60)
                     
-                except Exception as e:
-                    logger.error(f"Error in experiment cycle: {e}")
-                    console.print(f"[red]❌ Cycle error: {e}[/red]")
-                    await asyncio.sleep(60)  # Wait before retry
+                    except Exception as e:
+                        logger.error(f"Error in experiment cycle: {e}")
+                        console.print(f"[red]❌ Cycle error: {e}[/red]")
+                        await self._wait(60)  # Wait before retry
         
-        # Generate final report
-        await self._generate_final_report()
+            # Generate final report
+            await self._generate_final_report()
+        finally:
+            await self.controller.aclose()
     
     def _display_experiment_setup(self):
         """Display experiment setup information"""
         
-        group_counts = {}
-        for group_name, count in self.controller._get_group_counts().items():
-            group_counts[group_name] = count
+        if self._setup_panel is None:
+            self._setup_panel = self._build_setup_panel()
+        console.print(self._setup_panel)
+    
+    def _build_setup_panel(self) -> Panel:
+        """Build the setup panel; its contents are fixed once the experiment is initialized"""
+        
+        group_counts = self.controller._get_group_counts()
         
         setup_info = f"""
 [bold]Experiment Configuration[/bold]
 
-Start Time: {self.controller.experiment_start.strftime('%Y-%m-%d %H:%M:%S UTC')}
+Start Time: {self.controller.experiment_start:%Y-%m-%d %H:%M:%S} UTC
 Total Channels: {len(self.controller.experiment_channels)}
 
 Group Distribution:
@@ -135,100 +196,102 @@ Safety Limits:
 • Rollback triggers: {self.controller.ROLLBACK_REVENUE_THRESHOLD:.0%} revenue drop or {self.controller.ROLLBACK_FLOW_THRESHOLD:.0%} flow reduction
         """
         
-        console.print(Panel(setup_info.strip(), title="Experiment Setup"))
+        return Panel(setup_info.strip(), title="Experiment Setup")
     
-    def _create_status_display(self):
-        """Create live status display"""
+    def _build_status_display(self):
+        """Build the live status layout once; _update_status_display refreshes its cells"""
+        from rich.columns import Columns
+        from rich.console import Group
         
-        current_time = datetime.utcnow()
-        if self.controller.experiment_start:
-            elapsed_hours = (current_time - self.controller.experiment_start).total_seconds() / 3600
-        else:
-            elapsed_hours = 0
+        # Value cells are Text objects updated in place on every refresh
+        self._status_cells = {
+            label: Text() for label in
+            ("Current Phase", "Elapsed Hours", "Collection Cycles", "Data Points", "Last Collection")
+        }
+        self._activity_cells = {label: Text() for label in ("Fee Changes", "Rollbacks")}
         
         # Main status table
         status_table = Table(show_header=True, header_style="bold cyan")
         status_table.add_column("Metric", style="white")
         status_table.add_column("Value", style="green")
-        
-        status_table.add_row("Current Phase", self.controller.current_phase.value.title())
-        status_table.add_row("Elapsed Hours", f"{elapsed_hours:.1f}")
-        status_table.add_row("Collection Cycles", str(self.cycle_count))
-        status_table.add_row("Data Points", str(len(self.controller.data_points)))
-        status_table.add_row("Last Collection", current_time.strftime('%H:%M:%S UTC'))
-        
-        # Recent activity
-        recent_changes = 0
-        recent_rollbacks = 0
-        
-        for exp_channel in self.controller.experiment_channels.values():
-            # Count changes in last 24 hours
-            recent_changes += len([
-                change for change in exp_channel.change_history
-                if (current_time - datetime.fromisoformat(change['timestamp'])).total_seconds() < 24 * 3600
-            ])
-            
-            # Count rollbacks in last 24 hours  
-            recent_rollbacks += len([
-                change for change in exp_channel.change_history
-                if (current_time - datetime.fromisoformat(change['timestamp'])).total_seconds() < 24 * 3600
-                and 'ROLLBACK' in change['reason']
-            ])
+        for label, cell in self._status_cells.items():
+            status_table.add_row(label, cell)
         
         activity_table = Table(show_header=True, header_style="bold yellow")
         activity_table.add_column("Activity (24h)", style="white")
         activity_table.add_column("Count", style="green")
+        for label, cell in self._activity_cells.items():
+            activity_table.add_row(label, cell)
         
-        activity_table.add_row("Fee Changes", str(recent_changes))
-        activity_table.add_row("Rollbacks", str(recent_rollbacks))
-        
-        # Phase progress
-        phase_progress = self._calculate_phase_progress(elapsed_hours)
+        # Combine displays
+        status_panel = Panel(status_table, title="Experiment Status")
+        activity_panel = Panel(activity_table, title="Recent Activity")
         
-        progress_bar = Progress(
+        # Phase progress bar, updated in place alongside the tables
+        self._progress = Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
             TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
         )
+        self._phase_task = self._progress.add_task(description="Phase", total=100)
         
-        task = progress_bar.add_task(
-            description=f"{self.controller.current_phase.value.title()} Phase",
-            total=100
+        self._status_display = Group(
+            Columns([status_panel, activity_panel], equal=True),
+            self._progress
         )
-        progress_bar.update(task, completed=phase_progress)
+    
+    def _update_status_display(self):
+        """Refresh the live status display and return it"""
         
-        # Combine displays
-        from rich.columns import Columns
+        current_time = datetime.utcnow()
+        if self.controller.experiment_start:
+            elapsed_hours = (current_time - self.controller.experiment_start).total_seconds() / 3600
+        else:
+            elapsed_hours = 0
         
-        status_panel = Panel(status_table, title="Experiment Status")
-        activity_panel = Panel(activity_table, title="Recent Activity")
+        status = self._status_cells
+        status["Current Phase"].plain = self.controller.current_phase.value.title()
+        status["Elapsed Hours"].plain = f"{elapsed_hours:.1f}"
+        status["Collection Cycles"].plain = str(self.cycle_count)
+        status["Data Points"].plain = str(len(self.controller.data_points))
+        status["Last Collection"].plain = f"{current_time:%H:%M:%S} UTC"
         
-        return Columns([status_panel, activity_panel], equal=True)
+        # Recent activity (each channel keeps a rolling 24h window of its changes)
+        recent_changes = 0
+        recent_rollbacks = 0
+        now = current_time.replace(tzinfo=timezone.utc).timestamp()
+        
+        for exp_channel in self.controller.experiment_channels.values():
+            changes, rollbacks = exp_channel.recent_change_counts(now)
+            recent_changes += changes
+            recent_rollbacks += rollbacks
+        
+        self._activity_cells["Fee Changes"].plain = str(recent_changes)
+        self._activity_cells["Rollbacks"].plain = str(recent_rollbacks)
+        
+        # Phase progress
+        phase_progress = self._calculate_phase_progress(elapsed_hours, self.controller.current_phase)
+        
+        self._progress.update(
+            self._phase_task,
+            description=f"{status['Current Phase'].plain} Phase",
+            completed=phase_progress
+        )
+        
+        return self._status_display
     
-    def _calculate_phase_progress(self, elapsed_hours: float) -> float:
-        """Calculate progress within current phase"""
-        
-        if self.controller.current_phase == ExperimentPhase.BASELINE:
-            return min(100, (elapsed_hours / self.controller.BASELINE_HOURS) * 100)
-        
-        # Calculate cumulative hours for phase start
-        baseline_hours = self.controller.BASELINE_HOURS
-        phase_starts = {
-            ExperimentPhase.INITIAL: baseline_hours,
-            ExperimentPhase.MODERATE: baseline_hours + 48,
-            ExperimentPhase.AGGRESSIVE: baseline_hours + 96, 
-            ExperimentPhase.STABILIZATION: baseline_hours + 144
-        }
+    def _calculate_phase_progress(self, elapsed_hours: float, phase) -> float:
+        """Calculate progress within the given phase"""
         
-        if self.controller.current_phase in phase_starts:
-            phase_start = phase_starts[self.controller.current_phase]
-            phase_duration = self.controller.PHASE_DURATION_HOURS.get(self.controller.current_phase, 24)
-            phase_elapsed = elapsed_hours - phase_start
-            
-            return min(100, max(0, (phase_elapsed / phase_duration) * 100))
+        window = self._phase_windows.get(phase)
+        if window is None:
+            return 100
+        
+        phase_start, phase_duration = window
+        phase_elapsed = elapsed_hours - phase_start
         
-        return 100
+        return min(100, max(0, (phase_elapsed / phase_duration) * 100))
     
     async def _generate_final_report(self):
         """Generate and display final experiment report"""
@@ -296,9 +359,16 @@ Safety Events: {len(report['safety_events'])} rollbacks occurred
             
             # Save detailed report
             report_path = Path("experiment_data") / "final_report.json"
-            import json
-            with open(report_path, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
+            if ORJSON_AVAILABLE:
+                report_path.write_bytes(orjson.dumps(
+                    report,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC,
+                    default=str
+                ))
+            else:
+                import json
+                with open(report_path, 'w') as f:
+                    json.dump(report, f, indent=2, default=_json_default)
             
             console.print(f"\n[green]Detailed report saved to {report_path}[/green]")
             
@@ -326,7 +396,7 @@ def main(lnd_manage_url: str, lnd_rest_url: str, config: str, duration: int, int
     
     try:
         runner = ExperimentRunner(lnd_manage_url, lnd_rest_url, config)
-        asyncio.run(runner.run_experiment(duration, interval))
+        run_async(runner.run_experiment(duration, interval))
     except KeyboardInterrupt:
         console.print("\n[yellow]Experiment interrupted by user[/yellow]")
     except Exception as e:
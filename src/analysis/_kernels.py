@@ -0,0 +1,65 @@
+"""Compiled scoring kernels for channel metrics (used when numba is installed)"""
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+prange = numba.prange if NUMBA_AVAILABLE else range
+
+
+def _compute_scores(net_profit, monthly_flow, flow_imbalance, earnings_per_million,
+                    monthly_earnings, rebalance_costs, thresholds,
+                    out_profitability, out_activity, out_efficiency, out_overall):
+    """Score every channel in one fused loop, writing into the preallocated output arrays
+
+    thresholds is the analyzer's ScoreThresholds named tuple.
+    """
+    # Threshold normalizations as multipliers onto the 0-100 scale, so the
+    # loop body only divides where the divisor varies per channel
+    profit_scale = 100 / thresholds.excellent_profit
+    roi_scale = 100 / thresholds.excellent_roi
+    flow_scale = 100 / thresholds.excellent_flow
+    earnings_ppm_scale = 100 / thresholds.excellent_earnings_ppm
+
+    for i in prange(net_profit.shape[0]):
+        # Profitability: net profit and ROI (0-100)
+        profit = net_profit[i]
+        costs = rebalance_costs[i]
+        if profit <= 0:
+            profitability = 0.0
+        else:
+            profit_score = min(100.0, profit * profit_scale)
+            if costs > 0:
+                roi_score = min(100.0, (profit / max(1.0, costs)) * roi_scale)
+            else:
+                roi_score = 100.0
+            profitability = (profit_score + roi_score) / 2
+
+        # Activity: flow volume and balance (perfect balance = 100)
+        flow = monthly_flow[i]
+        if flow == 0:
+            activity = 0.0
+        else:
+            flow_score = min(100.0, flow * flow_scale)
+            activity = (flow_score + (1 - flow_imbalance[i]) * 100) / 2
+
+        # Efficiency: earnings per million routed, with a penalty for rebalance costs
+        earnings = monthly_earnings[i]
+        efficiency = min(100.0, earnings_per_million[i] * earnings_ppm_scale)
+        if earnings > 0:
+            efficiency = (efficiency + max(0.0, 1 - costs / earnings) * 100) / 2
+
+        out_profitability[i] = profitability
+        out_activity[i] = activity
+        out_efficiency[i] = efficiency
+        out_overall[i] = (profitability + activity + efficiency) / 3
+
+
+# cache=True persists the compiled kernel next to this module (or in numba's user
+# cache dir), so only the first run on a machine pays the JIT compile
+if NUMBA_AVAILABLE:
+    compute_scores = numba.njit(parallel=True, fastmath=True, cache=True)(_compute_scores)
+else:
+    compute_scores = None
@@ -1,20 +1,64 @@
 """Channel performance analyzer"""
 
+import asyncio
+import heapq
 import logging
-from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime, timedelta
+import time
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
+from datetime import datetime
 import numpy as np
+from pydantic import TypeAdapter, ValidationError
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 
+try:
+    from moka_py import Moka
+    MOKA_AVAILABLE = True
+except ImportError:
+    MOKA_AVAILABLE = False
+
 from ..api.client import LndManageClient
 from ..models.channel import Channel
-from ..utils.config import Config
+from ..utils.config import Config, OptimizationConfig
+from ._kernels import NUMBA_AVAILABLE, compute_scores
 
 logger = logging.getLogger(__name__)
 console = Console()
 
+# Validates a whole batch of raw channel records at once
+CHANNEL_LIST_ADAPTER = TypeAdapter(List[Channel])
+
+# Channels per metrics batch when analyzing data as it streams in
+METRICS_BATCH_SIZE = 256
+
+# Flow direction labels indexed by the vectorized direction code
+FLOW_DIRECTIONS = np.array(["none", "inbound", "outbound"], dtype=object)
+
+
+class ScoreThresholds(NamedTuple):
+    """Scoring and categorization thresholds, read from the config once"""
+    excellent_profit: float
+    excellent_roi: float
+    excellent_flow: float
+    excellent_earnings_ppm: float
+    high_score: float
+    min_profit: float
+    min_flow: float
+
+    @classmethod
+    def from_config(cls, config: Optional[Config] = None) -> 'ScoreThresholds':
+        optimization = config.optimization if config else OptimizationConfig()
+        return cls(
+            excellent_profit=float(optimization.excellent_monthly_profit_sats),
+            excellent_roi=float(optimization.excellent_roi_ratio),
+            excellent_flow=float(optimization.excellent_monthly_flow_sats),
+            excellent_earnings_ppm=float(optimization.excellent_earnings_per_million_ppm),
+            high_score=float(optimization.high_performance_score),
+            min_profit=float(optimization.min_profitable_sats),
+            min_flow=float(optimization.min_active_flow_sats),
+        )
+
 
 class ChannelMetrics:
     """Calculated metrics for a channel"""
@@ -26,108 +70,131 @@ class ChannelMetrics:
     
     def calculate_metrics(self):
         """Calculate all channel metrics"""
-        # Basic metrics
-        self.capacity = self.channel.capacity_sat_int
-        self.local_balance_ratio = self.channel.local_balance_ratio
+        values = self._compute_metric_arrays([self.channel], ScoreThresholds.from_config(self.config))
+        for name, column in values.items():
+            setattr(self, name, column[0])
+    
+    @classmethod
+    def from_channels(cls, channels: List[Channel],
+                      config: Optional[Config] = None,
+                      thresholds: Optional[ScoreThresholds] = None) -> List['ChannelMetrics']:
+        """Calculate metrics for many channels at once, column-wise on NumPy arrays"""
+        if not channels:
+            return []
         
-        # Flow metrics
-        if self.channel.flow_report:
-            self.monthly_flow = self.channel.total_flow_sats  # Already in sats
-            self.flow_direction = "outbound" if self.channel.net_flow_sats < 0 else "inbound"
-            self.flow_imbalance = abs(self.channel.net_flow_sats) / max(1, self.monthly_flow)
-        else:
-            self.monthly_flow = 0
-            self.flow_direction = "none"
-            self.flow_imbalance = 0
+        if thresholds is None:
+            thresholds = ScoreThresholds.from_config(config)
+        values = cls._compute_metric_arrays(channels, thresholds)
+        names = list(values)
+        results = []
+        for channel, row in zip(channels, zip(*values.values())):
+            channel_metrics = cls.__new__(cls)
+            channel_metrics.channel = channel
+            channel_metrics.config = config
+            channel_metrics.__dict__.update(zip(names, row))
+            results.append(channel_metrics)
+        return results
+    
+    @staticmethod
+    def _compute_metric_arrays(channels: List[Channel],
+                               thresholds: ScoreThresholds) -> Dict[str, list]:
+        """Compute every metric column for the given channels (structure of arrays)"""
+        n = len(channels)
+        # Extract the raw inputs in a single pass, then split into columns
+        rows = []
+        for c in channels:
+            flow, fees, rebalance = c.flow_report, c.fee_report, c.rebalance_report
+            rows.append((
+                bool(flow), bool(fees), bool(rebalance),
+                flow.total_flow_sats if flow else 0.0,
+                flow.net_flow / 1000 if flow else 0.0,
+                fees.total_fees_sats if fees else 0.0,
+                rebalance.net_rebalance_cost if rebalance else 0.0,
+            ))
+        raw = np.array(rows, dtype=np.float64).reshape(n, 7).T
+        has_flow, has_fees, has_rebalance = raw[:3].astype(bool)
+        total_flow, net_flow, total_fees, rebalance_cost = raw[3:]
         
-        # Fee metrics
-        if self.channel.fee_report:
-            self.monthly_earnings = self.channel.total_fees_sats  # Already in sats
-            self.earnings_per_million = (self.monthly_earnings * 1_000_000) / max(1, self.monthly_flow)
-        else:
-            self.monthly_earnings = 0
-            self.earnings_per_million = 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Flow metrics
+            monthly_flow = np.where(has_flow, total_flow, 0.0)  # Already in sats
+            abs_net_flow = np.abs(net_flow)
+            # Shared reciprocal for the per-flow ratios below
+            inv_flow = 1.0 / np.maximum(1, monthly_flow)
+            flow_imbalance = np.where(has_flow, abs_net_flow * inv_flow, 0.0)
+            # 0 = none, 1 = inbound, 2 = outbound
+            flow_direction_idx = has_flow * (1 + (net_flow < 0))
+            
+            # Fee metrics
+            monthly_earnings = np.where(has_fees, total_fees, 0.0)  # Already in sats
+            earnings_per_million = np.where(
+                has_fees, (monthly_earnings * 1_000_000) * inv_flow, 0.0
+            )
+            
+            # Rebalance metrics
+            rebalance_costs = np.where(has_rebalance, rebalance_cost / 1000, 0.0)  # Convert to sats
+            net_profit = monthly_earnings - rebalance_costs
+            has_rebalance_costs = rebalance_costs > 0
+            roi = net_profit / np.maximum(1, rebalance_costs)
+            # Profit with no rebalance costs: ROI is unbounded and scores as perfect
+            roi_saturated = ~has_rebalance_costs & (net_profit > 0)
+            
+            # Flow efficiency: 1.0 when flow is perfectly balanced bidirectionally
+            flow_efficiency = np.where(monthly_flow == 0, 0.0, 1.0 - (abs_net_flow / monthly_flow))
         
-        # Rebalance metrics
-        if self.channel.rebalance_report:
-            self.rebalance_costs = self.channel.rebalance_report.net_rebalance_cost / 1000  # Convert to sats
-            self.net_profit = self.monthly_earnings - self.rebalance_costs
-            self.roi = (self.net_profit / max(1, self.rebalance_costs)) if self.rebalance_costs > 0 else float('inf')
+        if NUMBA_AVAILABLE:
+            # One fused compiled loop instead of a chain of temporary arrays
+            profitability_score = np.empty(n)
+            activity_score = np.empty(n)
+            efficiency_score = np.empty(n)
+            overall_score = np.empty(n)
+            compute_scores(net_profit, monthly_flow, flow_imbalance, earnings_per_million,
+                           monthly_earnings, rebalance_costs, thresholds,
+                           profitability_score, activity_score, efficiency_score, overall_score)
         else:
-            self.rebalance_costs = 0
-            self.net_profit = self.monthly_earnings
-            self.roi = float('inf')
-        
-        # Performance scores
-        self.profitability_score = self._calculate_profitability_score(self.config)
-        self.activity_score = self._calculate_activity_score(self.config)
-        self.efficiency_score = self._calculate_efficiency_score(self.config)
-        self.flow_efficiency = self._calculate_flow_efficiency()
-        self.overall_score = (self.profitability_score + self.activity_score + self.efficiency_score) / 3
-    
-    def _calculate_profitability_score(self, config: Optional[Config] = None) -> float:
-        """Score based on net profit and ROI (0-100)"""
-        if self.net_profit <= 0:
-            return 0
-
-        # Get thresholds from config or use defaults
-        excellent_profit = 10000
-        excellent_roi = 2.0
-        if config:
-            excellent_profit = config.optimization.excellent_monthly_profit_sats
-            excellent_roi = config.optimization.excellent_roi_ratio
-
-        # Normalize profit
-        profit_score = min(100, (self.net_profit / excellent_profit) * 100)
-
-        # ROI score
-        roi_score = min(100, (self.roi / excellent_roi) * 100) if self.roi != float('inf') else 100
-
-        return (profit_score + roi_score) / 2
-    
-    def _calculate_activity_score(self, config: Optional[Config] = None) -> float:
-        """Score based on flow volume and consistency (0-100)"""
-        if self.monthly_flow == 0:
-            return 0
-
-        # Get threshold from config or use default
-        excellent_flow = 10_000_000
-        if config:
-            excellent_flow = config.optimization.excellent_monthly_flow_sats
-
-        # Normalize flow
-        flow_score = min(100, (self.monthly_flow / excellent_flow) * 100)
-
-        # Balance score (perfect balance = 100)
-        balance_score = (1 - self.flow_imbalance) * 100
-
-        return (flow_score + balance_score) / 2
-    
-    def _calculate_efficiency_score(self, config: Optional[Config] = None) -> float:
-        """Score based on earnings efficiency (0-100)"""
-        # Get threshold from config or use default
-        excellent_earnings_ppm = 1000
-        if config:
-            excellent_earnings_ppm = config.optimization.excellent_earnings_per_million_ppm
-
-        # Earnings per million sats routed
-        efficiency = min(100, (self.earnings_per_million / excellent_earnings_ppm) * 100)
-
-        # Penalty for high rebalance costs
-        if self.monthly_earnings > 0:
-            cost_ratio = self.rebalance_costs / self.monthly_earnings
-            cost_penalty = max(0, 1 - cost_ratio) * 100
-            return (efficiency + cost_penalty) / 2
-
-        return efficiency
-    
-    def _calculate_flow_efficiency(self) -> float:
-        """Calculate flow efficiency (how balanced the flow is)"""
-        if self.monthly_flow == 0:
-            return 0.0
+            # Threshold normalizations as multipliers onto the 0-100 scale
+            profit_scale = 100 / thresholds.excellent_profit
+            roi_scale = 100 / thresholds.excellent_roi
+            flow_scale = 100 / thresholds.excellent_flow
+            earnings_ppm_scale = 100 / thresholds.excellent_earnings_ppm
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                # Profitability: net profit and ROI (0-100)
+                profit_score = np.minimum(100, net_profit * profit_scale)
+                roi_score = np.where(has_rebalance_costs, np.minimum(100, roi * roi_scale), 100)
+                profitability_score = np.where(net_profit <= 0, 0.0, (profit_score + roi_score) / 2)
+                
+                # Activity: flow volume and balance (perfect balance = 100)
+                flow_score = np.minimum(100, monthly_flow * flow_scale)
+                balance_score = (1 - flow_imbalance) * 100
+                activity_score = np.where(monthly_flow == 0, 0.0, (flow_score + balance_score) / 2)
+                
+                # Efficiency: earnings per million routed, with a penalty for rebalance costs
+                efficiency = np.minimum(100, earnings_per_million * earnings_ppm_scale)
+                cost_penalty = np.maximum(0, 1 - rebalance_costs / monthly_earnings) * 100
+                efficiency_score = np.where(monthly_earnings > 0, (efficiency + cost_penalty) / 2, efficiency)
+            
+            overall_score = (profitability_score + activity_score + efficiency_score) / 3
         
-        # Perfect efficiency is 0 net flow (balanced bidirectional)
-        return 1.0 - (abs(self.channel.net_flow_sats) / self.monthly_flow)
+        return {
+            'capacity': [c.capacity_sat_int for c in channels],
+            'local_balance_ratio': [c.local_balance_ratio for c in channels],
+            'monthly_flow': monthly_flow.tolist(),
+            'flow_direction': FLOW_DIRECTIONS[flow_direction_idx].tolist(),
+            'flow_imbalance': flow_imbalance.tolist(),
+            'monthly_earnings': monthly_earnings.tolist(),
+            'earnings_per_million': earnings_per_million.tolist(),
+            'rebalance_costs': rebalance_costs.tolist(),
+            'net_profit': net_profit.tolist(),
+            'roi': [value if defined else None
+                    for value, defined in zip(roi.tolist(), has_rebalance_costs.tolist())],
+            'roi_saturated': roi_saturated.tolist(),
+            'profitability_score': profitability_score.tolist(),
+            'activity_score': activity_score.tolist(),
+            'efficiency_score': efficiency_score.tolist(),
+            'flow_efficiency': flow_efficiency.tolist(),
+            'overall_score': overall_score.tolist(),
+        }
 
 
 class ChannelAnalyzer:
@@ -136,14 +203,20 @@ class ChannelAnalyzer:
     def __init__(self, client: LndManageClient, config: Config, cache_ttl_seconds: int = 300):
         self.client = client
         self.config = config
+        self._thresholds = ScoreThresholds.from_config(config)
         self.cache_ttl_seconds = cache_ttl_seconds
-        self._metrics_cache: Dict[str, Tuple[ChannelMetrics, datetime]] = {}
-        self._last_cache_cleanup = datetime.utcnow()
+        if MOKA_AVAILABLE:
+            # Bounded TinyLFU cache; entries expire on their own after the TTL
+            self._metrics_cache = Moka(capacity=10_000, ttl=cache_ttl_seconds)
+        else:
+            # channel_id -> (metrics, time.monotonic_ns() when cached)
+            self._metrics_cache: Dict[str, Tuple[ChannelMetrics, int]] = {}
+        self._last_cache_cleanup = time.monotonic()
     
     async def analyze_channels(self, channel_ids: List[str], use_cache: bool = True) -> Dict[str, ChannelMetrics]:
         """Analyze all channels and return metrics with optional caching"""
-        # Cleanup old cache entries periodically (every hour)
-        if (datetime.utcnow() - self._last_cache_cleanup).total_seconds() > 3600:
+        # Cleanup old cache entries periodically (every hour); moka expires its own
+        if not MOKA_AVAILABLE and time.monotonic() - self._last_cache_cleanup > 3600:
             self._cleanup_cache()
 
         metrics = {}
@@ -151,15 +224,12 @@ class ChannelAnalyzer:
 
         # Check cache first if enabled
         if use_cache:
-            cache_cutoff = datetime.utcnow() - timedelta(seconds=self.cache_ttl_seconds)
+            cache_cutoff = time.monotonic_ns() - int(self.cache_ttl_seconds * 1e9)
             for channel_id in channel_ids:
-                if channel_id in self._metrics_cache:
-                    cached_metric, cache_time = self._metrics_cache[channel_id]
-                    if cache_time > cache_cutoff:
-                        metrics[channel_id] = cached_metric
-                        logger.debug(f"Using cached metrics for channel {channel_id}")
-                    else:
-                        channels_to_fetch.append(channel_id)
+                cached_metric = self._get_cached(channel_id, cache_cutoff)
+                if cached_metric is not None:
+                    metrics[channel_id] = cached_metric
+                    logger.debug(f"Using cached metrics for channel {channel_id}")
                 else:
                     channels_to_fetch.append(channel_id)
         else:
@@ -169,36 +239,85 @@ class ChannelAnalyzer:
         if channels_to_fetch:
             logger.info(f"Fetching fresh data for {len(channels_to_fetch)} channels "
                        f"(using cache for {len(metrics)})")
-            channel_data = await self.client.fetch_all_channel_data(channels_to_fetch)
-
-            # Convert to Channel models and calculate metrics
-            for data in channel_data:
-                try:
-                    # Add timestamp if not present
-                    if 'timestamp' not in data:
-                        data['timestamp'] = datetime.utcnow().isoformat()
 
-                    channel = Channel(**data)
-                    channel_id = channel.channel_id_compact
-                    channel_metrics = ChannelMetrics(channel, self.config)
-                    metrics[channel_id] = channel_metrics
+            # Model construction and scoring are CPU-bound; run them off the event loop
+            # in batches while the remaining channel data is still arriving
+            loop = asyncio.get_running_loop()
+            builds = []
+            batch = []
+            async for data in self.client.iter_channel_data(channels_to_fetch):
+                batch.append(data)
+                if len(batch) >= METRICS_BATCH_SIZE:
+                    builds.append(loop.run_in_executor(None, self._build_metrics, batch))
+                    batch = []
+            if batch:
+                builds.append(loop.run_in_executor(None, self._build_metrics, batch))
+
+            fresh_metrics = {}
+            for built in await asyncio.gather(*builds):
+                fresh_metrics.update(built)
+
+            cache_time = time.monotonic_ns()
+            for channel_id, channel_metrics in fresh_metrics.items():
+                metrics[channel_id] = channel_metrics
+
+                # Update cache
+                if use_cache:
+                    self._set_cached(channel_id, channel_metrics, cache_time)
 
-                    # Update cache
-                    if use_cache:
-                        self._metrics_cache[channel_id] = (channel_metrics, datetime.utcnow())
+        return metrics
 
-                    logger.debug(f"Analyzed channel {channel_id}: {metrics[channel_id].overall_score:.1f} score")
+    def _build_metrics(self, channel_data: List[Dict[str, Any]]) -> Dict[str, ChannelMetrics]:
+        """Convert raw channel data to Channel models and score them as one batch"""
+        timestamp = datetime.utcnow().isoformat()
+        for data in channel_data:
+            # Add timestamp if not present
+            if 'timestamp' not in data:
+                data['timestamp'] = timestamp
+
+        try:
+            # Validate the whole batch in a single pydantic-core call
+            channels = CHANNEL_LIST_ADAPTER.validate_python(channel_data)
+        except ValidationError:
+            # Some record is invalid; validate one by one so only that channel is dropped
+            channels = []
+            for data in channel_data:
+                try:
+                    channels.append(Channel(**data))
 
                 except Exception as e:
                     channel_id = data.get('channelIdCompact', data.get('channel_id', 'unknown'))
                     logger.error(f"Failed to analyze channel {channel_id}: {e}")
                     logger.debug(f"Channel data keys: {list(data.keys())}")
 
+        metrics = {}
+        for channel_metrics in ChannelMetrics.from_channels(channels, self.config, self._thresholds):
+            channel_id = channel_metrics.channel.channel_id_compact
+            metrics[channel_id] = channel_metrics
+            logger.debug(f"Analyzed channel {channel_id}: {channel_metrics.overall_score:.1f} score")
+
         return metrics
 
+    def _get_cached(self, channel_id: str, cache_cutoff: int) -> Optional[ChannelMetrics]:
+        """Return cached metrics for a channel, or None if missing or expired"""
+        if MOKA_AVAILABLE:
+            return self._metrics_cache.get(channel_id)
+
+        entry = self._metrics_cache.get(channel_id)
+        if entry is None or entry[1] <= cache_cutoff:
+            return None
+        return entry[0]
+
+    def _set_cached(self, channel_id: str, channel_metrics: ChannelMetrics, cache_time: int) -> None:
+        """Store metrics for a channel in the cache"""
+        if MOKA_AVAILABLE:
+            self._metrics_cache.set(channel_id, channel_metrics)
+        else:
+            self._metrics_cache[channel_id] = (channel_metrics, cache_time)
+
     def _cleanup_cache(self) -> None:
         """Remove expired entries from the metrics cache"""
-        cache_cutoff = datetime.utcnow() - timedelta(seconds=self.cache_ttl_seconds * 2)
+        cache_cutoff = time.monotonic_ns() - int(self.cache_ttl_seconds * 2 * 1e9)
         expired_keys = [
             channel_id for channel_id, (_, cache_time) in self._metrics_cache.items()
             if cache_time < cache_cutoff
@@ -210,16 +329,16 @@ class ChannelAnalyzer:
         if expired_keys:
             logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
 
-        self._last_cache_cleanup = datetime.utcnow()
+        self._last_cache_cleanup = time.monotonic()
 
     def clear_cache(self) -> None:
         """Manually clear the metrics cache"""
-        count = len(self._metrics_cache)
+        count = self._metrics_cache.count() if MOKA_AVAILABLE else len(self._metrics_cache)
         self._metrics_cache.clear()
         logger.info(f"Cleared {count} entries from metrics cache")
     
     def categorize_channels(self, metrics: Dict[str, ChannelMetrics]) -> Dict[str, List[ChannelMetrics]]:
-        """Categorize channels by performance using single-pass algorithm with configurable thresholds"""
+        """Categorize channels by performance in one vectorized pass with configurable thresholds"""
         categories = {
             'high_performers': [],
             'profitable': [],
@@ -228,24 +347,33 @@ class ChannelAnalyzer:
             'problematic': []
         }
 
-        # Get thresholds from config
-        high_score = self.config.optimization.high_performance_score
-        min_profit = self.config.optimization.min_profitable_sats
-        min_flow = self.config.optimization.min_active_flow_sats
-
-        # Single pass through all metrics with optimized conditional logic
-        for channel_metrics in metrics.values():
-            # Use elif chain for mutually exclusive categories (only one category per channel)
-            if channel_metrics.overall_score >= high_score:
-                categories['high_performers'].append(channel_metrics)
-            elif channel_metrics.net_profit > min_profit:
-                categories['profitable'].append(channel_metrics)
-            elif channel_metrics.monthly_flow > min_flow:
-                categories['active_unprofitable'].append(channel_metrics)
-            elif channel_metrics.monthly_flow == 0:
-                categories['inactive'].append(channel_metrics)
-            else:
-                categories['problematic'].append(channel_metrics)
+        high_score = self._thresholds.high_score
+        min_profit = self._thresholds.min_profit
+        min_flow = self._thresholds.min_flow
+
+        metrics_list = list(metrics.values())
+        n = len(metrics_list)
+        overall_score = np.fromiter((m.overall_score for m in metrics_list), dtype=np.float64, count=n)
+        net_profit = np.fromiter((m.net_profit for m in metrics_list), dtype=np.float64, count=n)
+        monthly_flow = np.fromiter((m.monthly_flow for m in metrics_list), dtype=np.float64, count=n)
+
+        # First matching condition wins, so each channel lands in exactly one category
+        category_ids = np.select(
+            [
+                overall_score >= high_score,
+                net_profit > min_profit,
+                monthly_flow > min_flow,
+                monthly_flow == 0,
+            ],
+            [0, 1, 2, 3],
+            default=4
+        )
+
+        # Slice an object array of the metrics with one boolean mask per category
+        metrics_array = np.empty(n, dtype=object)
+        metrics_array[:] = metrics_list
+        for category_id, name in enumerate(categories):
+            categories[name] = metrics_array[category_ids == category_id].tolist()
 
         return categories
     
@@ -277,7 +405,7 @@ Net Profit: {total_profit:,.0f} sats
                 console.print(f"\n[cyan]{category.replace('_', ' ').title()}:[/cyan] {len(channels)} channels")
                 
                 # Top channels in category
-                top_channels = sorted(channels, key=lambda x: x.overall_score, reverse=True)[:5]
+                top_channels = heapq.nlargest(5, channels, key=lambda x: x.overall_score)
                 table = Table(show_header=True, header_style="bold magenta")
                 table.add_column("Channel", style="dim")
                 table.add_column("Alias")
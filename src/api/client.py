@@ -1,13 +1,32 @@
 """LND Manage API Client"""
 
 import asyncio
+import json
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 import httpx
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 support in httpx
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Node aliases rarely change; many channels share the same peer
+ALIAS_CACHE_SIZE = 4096
+ALIAS_CACHE_TTL_SECONDS = 3600
+
 
 class LndManageClient:
     """Client for interacting with LND Manage API"""
@@ -17,11 +36,23 @@ class LndManageClient:
         self.client: Optional[httpx.AsyncClient] = None
         self.max_concurrent = max_concurrent
         self._semaphore: Optional[asyncio.Semaphore] = None
+        # GET requests currently on the wire, keyed by endpoint
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Channel data fetches currently running, keyed by channel ID
+        self._inflight_channels: Dict[str, asyncio.Future] = {}
+        # pubkey -> (fetch time, alias), least recently used first
+        self._alias_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
     
     async def __aenter__(self):
-        # Use connection pooling with limits
-        limits = httpx.Limits(max_connections=50, max_keepalive_connections=20)
-        self.client = httpx.AsyncClient(timeout=30.0, limits=limits)
+        # Use connection pooling with limits; keep enough idle connections for every
+        # concurrent request so bursts don't reconnect
+        limits = httpx.Limits(
+            max_connections=max(50, self.max_concurrent),
+            max_keepalive_connections=max(20, self.max_concurrent)
+        )
+        # HTTP/2 multiplexes requests over one connection (negotiated over TLS).
+        # httpx already requests gzip/deflate compressed responses by default.
+        self.client = httpx.AsyncClient(http2=H2_AVAILABLE, timeout=30.0, limits=limits)
         self._semaphore = asyncio.Semaphore(self.max_concurrent)
         return self
     
@@ -30,10 +61,29 @@ class LndManageClient:
             await self.client.aclose()
     
     async def _get(self, endpoint: str) -> Any:
-        """Make GET request to API"""
+        """Make GET request to API, coalescing concurrent requests for the same endpoint"""
         if not self.client:
             raise RuntimeError("Client not initialized. Use async with statement.")
         
+        request = self._inflight.get(endpoint)
+        if request is None:
+            request = asyncio.ensure_future(self._request(endpoint))
+            self._inflight[endpoint] = request
+            request.add_done_callback(lambda _: self._inflight.pop(endpoint, None))
+        
+        # Shield so one cancelled caller does not cancel the request for the others
+        body, is_json = await asyncio.shield(request)
+        
+        # Coalesced callers share the raw body; each parses its own copy so nested
+        # objects are never shared between them
+        if not is_json:
+            return body
+        if ORJSON_AVAILABLE:
+            return orjson.loads(body)
+        return json.loads(body)
+    
+    async def _request(self, endpoint: str) -> Tuple[Any, bool]:
+        """Perform a single GET request, returning (body, is JSON) undecoded"""
         url = f"{self.base_url}{endpoint}"
         logger.debug(f"GET {url}")
         
@@ -44,9 +94,9 @@ class LndManageClient:
             # Handle plain text responses (like alias endpoint)
             content_type = response.headers.get('content-type', '')
             if 'text/plain' in content_type:
-                return response.text
+                return response.text, False
             
-            return response.json()
+            return response.content, True
         except httpx.HTTPError as e:
             logger.error(f"API request failed: {e}")
             raise
@@ -124,11 +174,22 @@ class LndManageClient:
         }
     
     async def get_node_alias(self, pubkey: str) -> str:
-        """Get node alias"""
+        """Get node alias, cached per pubkey"""
+        cached = self._alias_cache.get(pubkey)
+        if cached is not None and time.monotonic() - cached[0] < ALIAS_CACHE_TTL_SECONDS:
+            self._alias_cache.move_to_end(pubkey)
+            return cached[1]
+        
         try:
-            return await self._get(f"/api/node/{pubkey}/alias")
+            alias = await self._get(f"/api/node/{pubkey}/alias")
         except Exception:
             return pubkey[:8] + "..."
+        
+        self._alias_cache[pubkey] = (time.monotonic(), alias)
+        self._alias_cache.move_to_end(pubkey)
+        if len(self._alias_cache) > ALIAS_CACHE_SIZE:
+            self._alias_cache.popitem(last=False)
+        return alias
     
     async def get_node_details(self, pubkey: str) -> Dict[str, Any]:
         """Get comprehensive node details"""
@@ -142,22 +203,35 @@ class LndManageClient:
         """Get node warnings"""
         return await self._get(f"/api/node/{pubkey}/warnings")
     
+    async def _open_channel_ids(self) -> List[str]:
+        """Get open channel IDs from the API response"""
+        response = await self.get_open_channels()
+        if isinstance(response, dict) and 'channels' in response:
+            return response['channels']
+        return response if isinstance(response, list) else []
+
+    @staticmethod
+    def _unique_channel_ids(channel_ids: List[str]) -> List[str]:
+        """Drop duplicate channel IDs, keeping the first occurrence of each"""
+        unique_ids = list(dict.fromkeys(channel_ids))
+        if len(unique_ids) != len(channel_ids):
+            logger.info(f"Dropped {len(channel_ids) - len(unique_ids)} duplicate channel IDs")
+        return unique_ids
+
     async def fetch_all_channel_data(self, channel_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Fetch comprehensive data for all channels using the /details endpoint with concurrency limiting"""
         if channel_ids is None:
-            # Get channel IDs from the API response
-            response = await self.get_open_channels()
-            if isinstance(response, dict) and 'channels' in response:
-                channel_ids = response['channels']
-            else:
-                channel_ids = response if isinstance(response, list) else []
+            channel_ids = await self._open_channel_ids()
+        channel_ids = self._unique_channel_ids(channel_ids)
 
         logger.info(f"Fetching data for {len(channel_ids)} channels (max {self.max_concurrent} concurrent)")
 
-        # Fetch data for all channels concurrently with semaphore limiting
+        # Fetch data for all channels concurrently with semaphore limiting;
+        # the whole batch shares one timestamp
+        timestamp = datetime.utcnow().isoformat()
         tasks = []
         for channel_id in channel_ids:
-            tasks.append(self._fetch_single_channel_data_limited(channel_id))
+            tasks.append(self._fetch_single_channel_data_limited(channel_id, timestamp))
 
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -172,35 +246,90 @@ class LndManageClient:
         logger.info(f"Successfully fetched data for {len(channel_data)}/{len(channel_ids)} channels")
         return channel_data
 
-    async def _fetch_single_channel_data_limited(self, channel_id: str) -> Dict[str, Any]:
+    async def iter_channel_data(self, channel_ids: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Like fetch_all_channel_data, but yield each channel's data as soon as it arrives
+
+        Results come in completion order, so callers can start processing while the
+        remaining fetches are still in flight.
+        """
+        if channel_ids is None:
+            channel_ids = await self._open_channel_ids()
+        channel_ids = self._unique_channel_ids(channel_ids)
+
+        logger.info(f"Streaming data for {len(channel_ids)} channels (max {self.max_concurrent} concurrent)")
+
+        timestamp = datetime.utcnow().isoformat()
+
+        async def fetch(channel_id: str):
+            try:
+                return channel_id, await self._fetch_single_channel_data_limited(channel_id, timestamp), None
+            except Exception as e:
+                return channel_id, None, e
+
+        tasks = [asyncio.ensure_future(fetch(channel_id)) for channel_id in channel_ids]
+        fetched = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                channel_id, data, error = await next_done
+                if error is not None:
+                    logger.error(f"Failed to fetch data for channel {channel_id}: {error}")
+                    continue
+                fetched += 1
+                yield data
+        finally:
+            # Stop outstanding fetches if the consumer bails out early
+            for task in tasks:
+                task.cancel()
+
+        logger.info(f"Successfully fetched data for {fetched}/{len(channel_ids)} channels")
+
+    async def _fetch_single_channel_data_limited(self, channel_id: str, timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """Fetch channel data, sharing one fetch between concurrent callers for the same channel"""
+        fetch = self._inflight_channels.get(channel_id)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch_channel_data_with_limit(channel_id, timestamp))
+            self._inflight_channels[channel_id] = fetch
+            fetch.add_done_callback(lambda _: self._inflight_channels.pop(channel_id, None))
+        
+        channel_data = await asyncio.shield(fetch)
+        # The shared fetch may have been started by a caller with another timestamp;
+        # stamp a per-caller copy so waiters neither share nor overwrite each other's dict
+        return {**channel_data, 'timestamp': timestamp or channel_data.get('timestamp')}
+    
+    async def _fetch_channel_data_with_limit(self, channel_id: str, timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Fetch channel data with semaphore limiting to prevent overwhelming the API"""
         if self._semaphore is None:
             # Fallback if semaphore not initialized (shouldn't happen in normal use)
-            return await self._fetch_single_channel_data(channel_id)
+            return await self._fetch_single_channel_data(channel_id, timestamp)
 
         async with self._semaphore:
-            return await self._fetch_single_channel_data(channel_id)
+            return await self._fetch_single_channel_data(channel_id, timestamp)
     
-    async def _fetch_single_channel_data(self, channel_id: str) -> Dict[str, Any]:
+    async def _fetch_single_channel_data(self, channel_id: str, timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Fetch all data for a single channel using the details endpoint"""
+        if timestamp is None:
+            timestamp = datetime.utcnow().isoformat()
+        
         try:
             # The /details endpoint provides all the data we need
             channel_data = await self.get_channel_details(channel_id)
-            channel_data['timestamp'] = datetime.utcnow().isoformat()
-            return channel_data
+            return {**channel_data, 'timestamp': timestamp}
         except Exception as e:
             logger.error(f"Failed to fetch details for channel {channel_id}: {e}")
             # Fallback to individual endpoints if details fails
-            return await self._fetch_single_channel_data_fallback(channel_id)
+            return await self._fetch_single_channel_data_fallback(channel_id, timestamp)
     
-    async def _fetch_single_channel_data_fallback(self, channel_id: str) -> Dict[str, Any]:
+    async def _fetch_single_channel_data_fallback(self, channel_id: str, timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Fallback method to fetch channel data using individual endpoints"""
+        if timestamp is None:
+            timestamp = datetime.utcnow().isoformat()
+        
         # Fetch basic info first
         try:
             info = await self.get_channel_info(channel_id)
         except Exception as e:
             logger.error(f"Failed to fetch basic info for channel {channel_id}: {e}")
-            return {'channelIdCompact': channel_id, 'timestamp': datetime.utcnow().isoformat()}
+            return {'channelIdCompact': channel_id, 'timestamp': timestamp}
         
         # Fetch additional data concurrently
         tasks = {
@@ -225,7 +354,7 @@ class LndManageClient:
         # Combine all data
         channel_data = {
             **info,
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': timestamp,
             **results
         }
         
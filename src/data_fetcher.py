@@ -1,15 +1,126 @@
 import httpx
 import asyncio
 import json
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import os
+import random
+import time
+from collections import OrderedDict
+from queue import Queue
+from typing import Dict, List, Optional, Any, Set, Tuple, Union
+from datetime import date, datetime
+from dataclasses import asdict, dataclass, is_dataclass
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 support in httpx
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Process-wide client shared by open fetchers, the event loop it was created on,
+# and how many fetchers currently hold it; see get_client()/release_client()
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_client_users = 0
+
+# Transient statuses worth retrying; anything else is returned as-is
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Failures of a single request that are logged and treated as missing data
+# (httpx errors, and ValueError for undecodable JSON/text bodies)
+FETCH_ERRORS = (httpx.HTTPError, ValueError)
+
+# How long a 404'd channel sub-resource is skipped before it is requested again
+# (e.g. a pending channel's policies appear once it opens)
+MISSING_ENDPOINT_TTL_SECONDS = 3 * 3600
+
+# Most URLs remembered for revalidation (about 15 per channel plus 13 per peer node)
+VALIDATED_CACHE_SIZE = 32768
+
+# url -> (ETag, Last-Modified, raw body, is JSON) for responses the server lets us
+# revalidate, least recently used first. Bodies are kept as bytes and decoded on
+# every hit, so no two callers ever share (and mutate) the same parsed object.
+_validated_responses: "OrderedDict[str, Tuple[Optional[str], Optional[str], bytes, bool]]" = OrderedDict()
+
+
+def _decode_body(content: bytes, is_json: bool) -> Any:
+    """Decode a response body: parsed JSON, or stripped text for scalar endpoints"""
+    if is_json:
+        if ORJSON_AVAILABLE:
+            return orjson.loads(content)
+        return json.loads(content)
+    # Scalar endpoints (sync status, block height, rating) return a few bytes of
+    # plain text; decode them directly rather than via httpx's .text
+    return content.strip().decode()
+
+
+async def _log_response(response: httpx.Response) -> None:
+    """Debug-only response hook"""
+    logger.debug(f"{response.request.method} {response.request.url} -> {response.status_code}")
+
+
+async def get_client() -> httpx.AsyncClient:
+    """Borrow the shared AsyncClient, creating it on first use; pair with release_client()"""
+    global _client, _client_loop, _client_users
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        # A client left over from another event loop (e.g. an earlier asyncio.run)
+        # is bound to that loop and can be neither used nor closed from this one.
+        # Each worker issues ~15 requests at once, so keep plenty of idle connections
+        # warm between fetches; httpx already asks for gzip/deflate responses.
+        # The logging hook is only installed at DEBUG to keep per-request overhead off.
+        event_hooks = {'response': [_log_response]} if logger.isEnabledFor(logging.DEBUG) else {}
+        _client = httpx.AsyncClient(
+            http2=H2_AVAILABLE,
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=200, keepalive_expiry=120),
+            event_hooks=event_hooks
+        )
+        _client_loop = loop
+        _client_users = 0
+    _client_users += 1
+    return _client
+
+
+async def release_client(client: httpx.AsyncClient) -> None:
+    """Return a client borrowed from get_client(), closing it once no fetcher holds it"""
+    global _client_users
+    if client is not _client:
+        # Already replaced (closed, or created for another loop); nothing to release
+        return
+    _client_users -= 1
+    if _client_users <= 0:
+        await close_client()
+
+
+async def close_client() -> None:
+    """Close the shared AsyncClient regardless of how many fetchers hold it"""
+    global _client, _client_loop, _client_users
+    if _client is None:
+        return
+    client, loop = _client, _client_loop
+    _client, _client_loop, _client_users = None, None, 0
+    if loop is asyncio.get_running_loop():
+        await client.aclose()
+
 @dataclass
 class ChannelData:
+    # One instance per channel; slots drop the per-instance __dict__
+    # (dataclass(slots=True) needs Python 3.10, so they are declared by hand)
+    __slots__ = (
+        'channel_id', 'basic_info', 'balance', 'policies', 'fee_report', 'flow_report',
+        'flow_report_7d', 'flow_report_30d', 'rating', 'rebalance_data', 'warnings',
+    )
+
     channel_id: str
     basic_info: Dict[str, Any]
     balance: Dict[str, Any]
@@ -22,48 +133,242 @@ class ChannelData:
     rebalance_data: Dict[str, Any]
     warnings: List[str]
 
+def _json_default(obj: Any) -> Any:
+    """json.dump fallback matching orjson: dataclasses as objects, dates as ISO, else str"""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _dump_indented(value: Any, indent: bytes) -> bytes:
+    """Encode value with 2-space indentation, nested under the given indent"""
+    if ORJSON_AVAILABLE:
+        encoded = orjson.dumps(value, default=str, option=orjson.OPT_INDENT_2)
+    else:
+        encoded = json.dumps(value, indent=2, ensure_ascii=False, default=_json_default).encode()
+    return encoded.replace(b"\n", b"\n" + indent)
+
+
+def _dump_key(key: Any) -> bytes:
+    """Encode a dict key as a JSON string"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(str(key))
+    return json.dumps(str(key), ensure_ascii=False).encode()
+
+
+def _write_json_stream(f, data: Dict[str, Any]) -> None:
+    """Write the same bytes as orjson.dumps(data, OPT_INDENT_2), one channel/node at a time
+
+    Top-level dicts (channels, nodes) are encoded entry by entry, so the whole
+    document is never materialized as a single buffer.
+    """
+    if not data:
+        f.write(b"{}")
+        return
+
+    f.write(b"{\n")
+    for i, (key, value) in enumerate(data.items()):
+        if i:
+            f.write(b",\n")
+        f.write(b"  " + _dump_key(key) + b": ")
+        if isinstance(value, dict) and value:
+            f.write(b"{\n")
+            for j, (entry_key, entry) in enumerate(value.items()):
+                if j:
+                    f.write(b",\n")
+                f.write(b"    " + _dump_key(entry_key) + b": " + _dump_indented(entry, b"    "))
+            f.write(b"\n  }")
+        else:
+            f.write(_dump_indented(value, b"  "))
+    f.write(b"\n}")
+
+
+# (result key, path under /channel/<id>/) for every per-channel endpoint
+_CHANNEL_ENDPOINTS: Tuple[Tuple[str, str], ...] = (
+    ('basic_info', ''),
+    ('balance', 'balance'),
+    ('policies', 'policies'),
+    ('fee_report', 'fee-report'),
+    ('flow_report', 'flow-report'),
+    ('flow_report_7d', 'flow-report/last-days/7'),
+    ('flow_report_30d', 'flow-report/last-days/30'),
+    ('rating', 'rating'),
+    ('warnings', 'warnings'),
+    ('rebalance_source_costs', 'rebalance-source-costs'),
+    ('rebalance_source_amount', 'rebalance-source-amount'),
+    ('rebalance_target_costs', 'rebalance-target-costs'),
+    ('rebalance_target_amount', 'rebalance-target-amount'),
+    ('rebalance_support_source', 'rebalance-support-as-source-amount'),
+    ('rebalance_support_target', 'rebalance-support-as-target-amount'),
+)
+_CHANNEL_ENDPOINT_KEYS = tuple(key for key, _ in _CHANNEL_ENDPOINTS)
+
+# ChannelData field filled by each channel endpoint (the rebalance-* ones all feed rebalance_data)
+_CHANNEL_ENDPOINT_FIELDS = tuple(
+    'rebalance_data' if key.startswith('rebalance_') else key for key in _CHANNEL_ENDPOINT_KEYS
+)
+
+# ChannelData fields that can be requested from get_channel_details
+CHANNEL_FIELDS = frozenset(_CHANNEL_ENDPOINT_FIELDS)
+
+# (result key, path under /node/<pubkey>/) for every per-node endpoint
+_NODE_ENDPOINTS: Tuple[Tuple[str, str], ...] = (
+    ('alias', 'alias'),
+    ('open_channels', 'open-channels'),
+    ('all_channels', 'all-channels'),
+    ('balance', 'balance'),
+    ('fee_report', 'fee-report'),
+    ('fee_report_7d', 'fee-report/last-days/7'),
+    ('fee_report_30d', 'fee-report/last-days/30'),
+    ('flow_report', 'flow-report'),
+    ('flow_report_7d', 'flow-report/last-days/7'),
+    ('flow_report_30d', 'flow-report/last-days/30'),
+    ('on_chain_costs', 'on-chain-costs'),
+    ('rating', 'rating'),
+    ('warnings', 'warnings'),
+)
+_NODE_ENDPOINT_KEYS = tuple(key for key, _ in _NODE_ENDPOINTS)
+
+
+def _is_channel_subresource(endpoint: str) -> bool:
+    """True for /channel/<id>/<resource> paths, the only ones a 404 may be remembered for"""
+    return endpoint.startswith("/channel/") and not endpoint.endswith("/")
+
+
 class LightningDataFetcher:
     """Async Lightning Network data fetcher using httpx for non-blocking I/O"""
 
-    def __init__(self, base_url: str = "http://localhost:18081/api", max_concurrent: int = 10):
+    def __init__(self, base_url: str = "http://localhost:18081/api", max_concurrent: int = 10,
+                 missing_endpoints_file: Optional[str] = None, max_retries: int = 3,
+                 retry_delay: float = 1.0):
         self.base_url = base_url
         self.max_concurrent = max_concurrent
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
         self.client: Optional[httpx.AsyncClient] = None
-        self._semaphore: Optional[asyncio.Semaphore] = None
+        # Node fetches for the current run, keyed by pubkey; concurrent and repeat
+        # callers for the same peer share one fetch
+        self._node_futures: Dict[str, asyncio.Future] = {}
+
+        # Channel sub-resources that returned 404 (e.g. policies of a pending channel),
+        # mapped to when they did; skipped for MISSING_ENDPOINT_TTL_SECONDS and
+        # optionally remembered across runs in missing_endpoints_file
+        self.missing_endpoints_file = missing_endpoints_file
+        self._known_missing: Dict[str, float] = {}
+        self._fetch_completed = False
+        if missing_endpoints_file and os.path.exists(missing_endpoints_file):
+            try:
+                with open(missing_endpoints_file) as f:
+                    saved = json.load(f)
+                if not isinstance(saved, dict):
+                    raise ValueError("expected an object of endpoint -> timestamp")
+                now = time.time()
+                self._known_missing = {
+                    endpoint: float(missing_since) for endpoint, missing_since in saved.items()
+                    if now - float(missing_since) < MISSING_ENDPOINT_TTL_SECONDS
+                }
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable {missing_endpoints_file}: {e}")
 
     async def __aenter__(self):
         """Async context manager entry"""
-        limits = httpx.Limits(max_connections=50, max_keepalive_connections=20)
-        self.client = httpx.AsyncClient(timeout=10.0, limits=limits)
-        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self.client = await get_client()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.client:
-            await self.client.aclose()
+        """Async context manager exit; closes the shared client when the last fetcher leaves"""
+        client, self.client = self.client, None
+        if client is not None:
+            await release_client(client)
+        # Only persist what a successful fetch observed; a failed run may have seen
+        # 404s from an API that was still starting up
+        if self.missing_endpoints_file and exc_type is None and self._fetch_completed:
+            with open(self.missing_endpoints_file, 'w') as f:
+                json.dump(self._known_missing, f, indent=2, sort_keys=True)
+
+    async def _send(self, url: str, headers: Dict[str, str]) -> httpx.Response:
+        """GET url, retrying transport errors and transient statuses with jittered backoff"""
+        attempts = max(1, self.max_retries)
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                response = await self.client.get(url, headers=headers)
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES or last_attempt:
+                    return response
+
+            # Exponential backoff capped at 10s, with full jitter so workers don't retry in lockstep
+            await asyncio.sleep(random.uniform(0, min(10.0, self.retry_delay * 2 ** attempt)))
 
     async def _get(self, endpoint: str) -> Optional[Any]:
-        """Make async GET request to API endpoint"""
+        """Make async GET request to API endpoint
+
+        Returns None for non-200 responses; transport and decode errors propagate
+        to the caller's gather, which logs them (see _drop_failures).
+        """
         if not self.client:
             raise RuntimeError("Client not initialized. Use async with statement.")
 
-        try:
-            url = f"{self.base_url}{endpoint}"
-            response = await self.client.get(url)
-            if response.status_code == 200:
-                content_type = response.headers.get('content-type', '')
-                if 'application/json' in content_type:
-                    return response.json()
-                else:
-                    return response.text.strip()
-            else:
-                logger.warning(f"Failed to fetch {endpoint}: {response.status_code}")
+        missing_since = self._known_missing.get(endpoint)
+        if missing_since is not None:
+            if time.time() - missing_since < MISSING_ENDPOINT_TTL_SECONDS:
                 return None
-        except Exception as e:
-            logger.error(f"Error fetching {endpoint}: {e}")
+            del self._known_missing[endpoint]
+
+        url = f"{self.base_url}{endpoint}"
+
+        # Revalidate a previously seen response instead of downloading it again
+        headers = {}
+        cached = _validated_responses.get(url)
+        if cached is not None:
+            etag, last_modified, _, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        response = await self._send(url, headers)
+        if response.status_code == 304 and cached is not None:
+            _validated_responses.move_to_end(url)
+            return _decode_body(cached[2], cached[3])
+        if response.status_code == 200:
+            is_json = 'application/json' in response.headers.get('content-type', '')
+            content = response.content
+            result = _decode_body(content, is_json)
+
+            etag = response.headers.get('etag')
+            last_modified = response.headers.get('last-modified')
+            if etag or last_modified:
+                _validated_responses[url] = (etag, last_modified, content, is_json)
+                _validated_responses.move_to_end(url)
+                if len(_validated_responses) > VALIDATED_CACHE_SIZE:
+                    _validated_responses.popitem(last=False)
+            return result
+        else:
+            if response.status_code == 404 and _is_channel_subresource(endpoint):
+                self._known_missing[endpoint] = time.time()
+            logger.warning(f"Failed to fetch {endpoint}: {response.status_code}")
             return None
     
+    @staticmethod
+    def _drop_failures(labels: Tuple[str, ...], results: List[Any]) -> List[Any]:
+        """Replace failed requests in gather(return_exceptions=True) results with None
+
+        Request and decode errors are logged; any other exception is a bug and is re-raised.
+        """
+        for i, result in enumerate(results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, FETCH_ERRORS):
+                    raise result
+                logger.error(f"Error fetching {labels[i]}: {result}")
+                results[i] = None
+        return results
+
     async def check_sync_status(self) -> bool:
         """Check if lnd is synced to chain"""
         result = await self._get("/status/synced-to-chain")
@@ -84,32 +389,31 @@ class LightningDataFetcher:
         result = await self._get("/status/all-channels")
         return result if isinstance(result, list) else []
     
-    async def get_channel_details(self, channel_id: str) -> ChannelData:
-        """Fetch comprehensive data for a specific channel using concurrent requests"""
+    async def get_channel_details(self, channel_id: str, fields: Optional[Set[str]] = None) -> ChannelData:
+        """Fetch data for a specific channel using concurrent requests
+
+        fields limits the fetch to a subset of CHANNEL_FIELDS; fields left out get
+        the same empty defaults as a failed request. Defaults to all fields.
+        """
         logger.info(f"Fetching data for channel {channel_id}")
 
-        # Fetch all data concurrently for better performance
-        tasks = {
-            'basic_info': self._get(f"/channel/{channel_id}/"),
-            'balance': self._get(f"/channel/{channel_id}/balance"),
-            'policies': self._get(f"/channel/{channel_id}/policies"),
-            'fee_report': self._get(f"/channel/{channel_id}/fee-report"),
-            'flow_report': self._get(f"/channel/{channel_id}/flow-report"),
-            'flow_report_7d': self._get(f"/channel/{channel_id}/flow-report/last-days/7"),
-            'flow_report_30d': self._get(f"/channel/{channel_id}/flow-report/last-days/30"),
-            'rating': self._get(f"/channel/{channel_id}/rating"),
-            'warnings': self._get(f"/channel/{channel_id}/warnings"),
-            'rebalance_source_costs': self._get(f"/channel/{channel_id}/rebalance-source-costs"),
-            'rebalance_source_amount': self._get(f"/channel/{channel_id}/rebalance-source-amount"),
-            'rebalance_target_costs': self._get(f"/channel/{channel_id}/rebalance-target-costs"),
-            'rebalance_target_amount': self._get(f"/channel/{channel_id}/rebalance-target-amount"),
-            'rebalance_support_source': self._get(f"/channel/{channel_id}/rebalance-support-as-source-amount"),
-            'rebalance_support_target': self._get(f"/channel/{channel_id}/rebalance-support-as-target-amount"),
-        }
+        if fields is None:
+            endpoints, keys = _CHANNEL_ENDPOINTS, _CHANNEL_ENDPOINT_KEYS
+        else:
+            unknown = set(fields) - CHANNEL_FIELDS
+            if unknown:
+                raise ValueError(f"Unknown channel fields: {', '.join(sorted(unknown))}")
+            endpoints = tuple(
+                endpoint for endpoint, field in zip(_CHANNEL_ENDPOINTS, _CHANNEL_ENDPOINT_FIELDS)
+                if field in fields
+            )
+            keys = tuple(key for key, _ in endpoints)
 
-        # Execute all requests concurrently
-        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
-        data = dict(zip(tasks.keys(), results))
+        # Fetch all data concurrently for better performance
+        prefix = "/channel/" + channel_id + "/"
+        urls = tuple(prefix + suffix for _, suffix in endpoints)
+        results = await asyncio.gather(*[self._get(url) for url in urls], return_exceptions=True)
+        data = dict(zip(keys, self._drop_failures(urls, results)))
 
         # Build rebalance data
         rebalance_data = {
@@ -136,29 +440,31 @@ class LightningDataFetcher:
         )
     
     async def get_node_data(self, pubkey: str) -> Dict[str, Any]:
+        """Fetch comprehensive data for a specific node, once per pubkey per run"""
+        fetch = self._node_futures.get(pubkey)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch_node_data(pubkey))
+            self._node_futures[pubkey] = fetch
+
+            def _forget_failure(f: asyncio.Future) -> None:
+                # Keep successful results for the run, but let a failed fetch be retried
+                if f.cancelled() or f.exception() is not None:
+                    self._node_futures.pop(pubkey, None)
+
+            fetch.add_done_callback(_forget_failure)
+
+        # Shield so one cancelled caller does not cancel the fetch for the others
+        return await asyncio.shield(fetch)
+
+    async def _fetch_node_data(self, pubkey: str) -> Dict[str, Any]:
         """Fetch comprehensive data for a specific node using concurrent requests"""
         logger.info(f"Fetching data for node {pubkey[:10]}...")
 
         # Fetch all node data concurrently
-        tasks = {
-            "alias": self._get(f"/node/{pubkey}/alias"),
-            "open_channels": self._get(f"/node/{pubkey}/open-channels"),
-            "all_channels": self._get(f"/node/{pubkey}/all-channels"),
-            "balance": self._get(f"/node/{pubkey}/balance"),
-            "fee_report": self._get(f"/node/{pubkey}/fee-report"),
-            "fee_report_7d": self._get(f"/node/{pubkey}/fee-report/last-days/7"),
-            "fee_report_30d": self._get(f"/node/{pubkey}/fee-report/last-days/30"),
-            "flow_report": self._get(f"/node/{pubkey}/flow-report"),
-            "flow_report_7d": self._get(f"/node/{pubkey}/flow-report/last-days/7"),
-            "flow_report_30d": self._get(f"/node/{pubkey}/flow-report/last-days/30"),
-            "on_chain_costs": self._get(f"/node/{pubkey}/on-chain-costs"),
-            "rating": self._get(f"/node/{pubkey}/rating"),
-            "warnings": self._get(f"/node/{pubkey}/warnings")
-        }
-
-        # Execute all requests concurrently
-        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
-        data = dict(zip(tasks.keys(), results))
+        prefix = "/node/" + pubkey + "/"
+        urls = tuple(prefix + suffix for _, suffix in _NODE_ENDPOINTS)
+        results = await asyncio.gather(*[self._get(url) for url in urls], return_exceptions=True)
+        data = dict(zip(_NODE_ENDPOINT_KEYS, self._drop_failures(urls, results)))
 
         return {
             "pubkey": pubkey,
@@ -177,54 +483,97 @@ class LightningDataFetcher:
             "warnings": data.get('warnings') or []
         }
     
-    async def fetch_all_data(self) -> Dict[str, Any]:
-        """Fetch all channel and node data with concurrency limiting"""
+    async def fetch_all_data(self, sink: Optional[Union[asyncio.Queue, Queue]] = None,
+                             fields: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """Fetch all channel and node data with a bounded pool of workers
+
+        If sink (an asyncio or thread-safe queue) is given, ('header', None, summary),
+        then ('channel', id, ChannelData) and ('node', pubkey, data) items are put on
+        it as soon as each is available.
+        fields is passed to get_channel_details; peer nodes are only discovered
+        (and fetched) when it includes basic_info.
+        """
         logger.info("Starting comprehensive data fetch...")
+        self._node_futures.clear()
+        self._fetch_completed = False
 
-        # Check sync status
-        if not await self.check_sync_status():
-            logger.warning("Node is not synced to chain!")
+        # Check sync status and get basic info
+        results = await asyncio.gather(
+            self.check_sync_status(),
+            self.get_block_height(),
+            self.get_open_channels(),
+            self.get_all_channels(),
+            return_exceptions=True
+        )
+        synced, block_height, open_channels, all_channels = self._drop_failures(
+            ("sync status", "block height", "open channels", "all channels"), results
+        )
+        open_channels = open_channels or []
+        all_channels = all_channels or []
 
-        # Get basic info
-        block_height = await self.get_block_height()
-        open_channels = await self.get_open_channels()
-        all_channels = await self.get_all_channels()
+        if not synced:
+            logger.warning("Node is not synced to chain!")
 
         logger.info(f"Block height: {block_height}")
         logger.info(f"Open channels: {len(open_channels)}")
         logger.info(f"Total channels: {len(all_channels)}")
+        if sink is not None:
+            sink.put_nowait(('header', None, {
+                "block_height": block_height,
+                "open_channels": open_channels,
+                "all_channels": all_channels,
+            }))
 
-        # Fetch detailed channel data with semaphore limiting
-        async def fetch_channel_limited(channel_id: str):
-            async with self._semaphore:
-                try:
-                    return channel_id, await self.get_channel_details(channel_id)
-                except Exception as e:
-                    logger.error(f"Error fetching channel {channel_id}: {e}")
-                    return channel_id, None
-
-        channel_tasks = [fetch_channel_limited(cid) for cid in open_channels]
-        channel_results = await asyncio.gather(*channel_tasks)
-        channels_data = {cid: data for cid, data in channel_results if data is not None}
-
-        # Get unique node pubkeys from channel data
-        node_pubkeys = set()
-        for channel_data in channels_data.values():
-            if 'remotePubkey' in channel_data.basic_info:
-                node_pubkeys.add(channel_data.basic_info['remotePubkey'])
-
-        # Fetch node data with semaphore limiting
-        async def fetch_node_limited(pubkey: str):
-            async with self._semaphore:
+        # A fixed pool of workers drains one job queue, so only max_concurrent fetches
+        # (and coroutines) exist at a time regardless of how many channels there are
+        channels_data: Dict[str, ChannelData] = {}
+        nodes_data: Dict[str, Dict[str, Any]] = {}
+        seen_pubkeys = set()
+        jobs: asyncio.Queue = asyncio.Queue()
+        for channel_id in open_channels:
+            jobs.put_nowait(('channel', channel_id))
+
+        async def worker():
+            while True:
+                kind, key = await jobs.get()
                 try:
-                    return pubkey, await self.get_node_data(pubkey)
+                    if kind == 'channel':
+                        channel_data = await self.get_channel_details(key, fields)
+                        channels_data[key] = channel_data
+                        if sink is not None:
+                            sink.put_nowait(('channel', key, channel_data))
+
+                        # Queue the peer's node fetch right away, once per unique pubkey
+                        if 'remotePubkey' in channel_data.basic_info:
+                            pubkey = channel_data.basic_info['remotePubkey']
+                            if pubkey not in seen_pubkeys:
+                                seen_pubkeys.add(pubkey)
+                                jobs.put_nowait(('node', pubkey))
+                    else:
+                        node_data = await self.get_node_data(key)
+                        nodes_data[key] = node_data
+                        if sink is not None:
+                            sink.put_nowait(('node', key, node_data))
                 except Exception as e:
-                    logger.error(f"Error fetching node {pubkey[:10]}...: {e}")
-                    return pubkey, None
+                    if kind == 'channel':
+                        logger.error(f"Error fetching channel {key}: {e}")
+                    else:
+                        logger.error(f"Error fetching node {key[:10]}...: {e}")
+                finally:
+                    jobs.task_done()
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.max_concurrent)]
+        try:
+            await jobs.join()
+        finally:
+            for w in workers:
+                w.cancel()
 
-        node_tasks = [fetch_node_limited(pubkey) for pubkey in node_pubkeys]
-        node_results = await asyncio.gather(*node_tasks)
-        nodes_data = {pubkey: data for pubkey, data in node_results if data is not None}
+        # Report channels in open-channel order rather than completion order
+        channels_data = {cid: channels_data[cid] for cid in open_channels if cid in channels_data}
+
+        # Only trust the 404s seen in this run if the API answered its status calls
+        self._fetch_completed = block_height is not None
 
         return {
             "block_height": block_height,
@@ -234,16 +583,100 @@ class LightningDataFetcher:
             "nodes": nodes_data
         }
     
-    def save_data(self, data: Dict[str, Any], filename: str = "lightning_data.json"):
-        """Save fetched data to JSON file"""
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+    async def fetch_and_save(self, filename: str = "lightning_data.json",
+                             fields: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """Fetch all data, writing each channel to filename while the rest are still in flight
+
+        Channels appear in the file in completion order; nodes follow once all
+        channels are done. Returns the same data as fetch_all_data.
+        """
+        # Unbounded: fetch_all_data keeps every result for its return value anyway,
+        # and fetch workers never block on a slow or failed writer. The writer runs
+        # in a worker thread, so encoding and disk writes stay off the event loop.
+        queue: Queue = Queue()
+        # Stream into a temporary file so a failed fetch never leaves a truncated filename
+        tmp_filename = filename + ".tmp"
+        loop = asyncio.get_running_loop()
+        writer = loop.run_in_executor(None, self._stream_writer, queue, tmp_filename)
+        saved = False
+        try:
+            try:
+                data = await self.fetch_all_data(sink=queue, fields=fields)
+            finally:
+                # End of stream, also on failure, so the writer thread always exits
+                queue.put_nowait(None)
+                await writer
+            os.replace(tmp_filename, filename)
+            saved = True
+        finally:
+            if not saved:
+                try:
+                    os.unlink(tmp_filename)
+                except OSError:
+                    pass
+        logger.info(f"Data saved to {filename}")
+        return data
+
+    def _stream_writer(self, queue: Queue, filename: str) -> None:
+        """Consume fetch_all_data sink items and stream them to filename as JSON (runs in a thread)"""
+        with open(filename, 'wb', buffering=1 << 20) as f:
+            channel_count = 0
+            nodes: Dict[str, Dict[str, Any]] = {}
+            while True:
+                item = queue.get()
+                if item is None:
+                    break
+                kind, key, value = item
+                if kind == 'header':
+                    f.write(b"{\n")
+                    for name, entry in value.items():
+                        f.write(b"  " + _dump_key(name) + b": " + _dump_indented(entry, b"  ") + b",\n")
+                    f.write(b'  "channels": {')
+                elif kind == 'channel':
+                    f.write(b",\n    " if channel_count else b"\n    ")
+                    f.write(_dump_key(key) + b": " + _dump_indented(value, b"    "))
+                    channel_count += 1
+                else:
+                    # Nodes can finish before the last channel, so hold them until
+                    # the channels object is closed
+                    nodes[key] = value
+
+            f.write(b"\n  },\n" if channel_count else b"},\n")
+            f.write(b'  "nodes": ')
+            if nodes:
+                f.write(b"{\n")
+                f.write(b",\n".join(
+                    b"    " + _dump_key(pubkey) + b": " + _dump_indented(node, b"    ")
+                    for pubkey, node in nodes.items()
+                ))
+                f.write(b"\n  }")
+            else:
+                f.write(b"{}")
+            f.write(b"\n}")
+
+    async def save_data(self, data: Dict[str, Any], filename: str = "lightning_data.json"):
+        """Save fetched data to JSON file without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write_data, data, filename)
         logger.info(f"Data saved to {filename}")
 
+    def _write_data(self, data: Dict[str, Any], filename: str) -> None:
+        """Write data to a temporary file and atomically move it over filename"""
+        tmp_filename = filename + ".tmp"
+        if ORJSON_AVAILABLE:
+            # orjson serializes the ChannelData dataclasses natively
+            with open(tmp_filename, 'wb', buffering=1 << 20) as f:
+                _write_json_stream(f, data)
+        else:
+            with open(tmp_filename, 'w') as f:
+                json.dump(data, f, indent=2, default=_json_default)
+        os.replace(tmp_filename, filename)
+
 if __name__ == "__main__":
+    from utils.aio import run_async  # run as a script, so src/ is on sys.path
+
     async def main():
         async with LightningDataFetcher() as fetcher:
-            all_data = await fetcher.fetch_all_data()
-            fetcher.save_data(all_data, "lightning_data.json")
+            await fetcher.fetch_and_save("lightning_data.json")
 
-    asyncio.run(main())
\ No newline at end of file
+    run_async(main())
@@ -4,9 +4,11 @@ import asyncio
 import logging
 import json
 import hashlib
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List, Optional, Tuple, Any
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 import pandas as pd
 import numpy as np
@@ -48,6 +50,44 @@ class ExperimentPhase(Enum):
     COMPLETE = "complete"
 
 
+# Phase reported for each parameter set (kept for backward compatibility)
+PHASE_BY_PARAMETER_SET = {
+    ParameterSet.BASELINE: ExperimentPhase.BASELINE,
+    ParameterSet.CONSERVATIVE: ExperimentPhase.INITIAL,
+    ParameterSet.AGGRESSIVE: ExperimentPhase.MODERATE,
+    ParameterSet.ADVANCED: ExperimentPhase.AGGRESSIVE,
+    ParameterSet.STABILIZATION: ExperimentPhase.STABILIZATION
+}
+
+
+def change_epoch(change: Dict[str, Any]) -> float:
+    """Return a change record's UTC timestamp as epoch seconds.
+    
+    New records carry 'ts_epoch' from the moment they are written; records loaded
+    from the database only have the ISO 'timestamp', which is parsed once and
+    cached on the record so later scans are plain float comparisons.
+    """
+    ts = change.get('ts_epoch')
+    if ts is None:
+        ts = datetime.fromisoformat(change['timestamp']).replace(tzinfo=timezone.utc).timestamp()
+        change['ts_epoch'] = ts
+    return ts
+
+
+def is_rollback(change: Dict[str, Any]) -> bool:
+    """Return whether a change record is a rollback.
+    
+    New records carry the 'is_rollback' flag from the moment they are written;
+    for records loaded from the database it is derived from the reason once and
+    cached on the record.
+    """
+    flag = change.get('is_rollback')
+    if flag is None:
+        flag = 'ROLLBACK' in change.get('reason', '')
+        change['is_rollback'] = flag
+    return flag
+
+
 @dataclass
 class ExperimentChannel:
     """Channel configuration for experiment"""
@@ -62,11 +102,39 @@ class ExperimentChannel:
     peer_pubkey: str         # Peer public key for competitive analysis
     original_metrics: Optional[Dict] = None
     change_history: List[Dict] = None
+    # Rolling (ts_epoch, is_rollback) window over change_history, built on first use
+    _recent_changes: Optional[Deque[Tuple[float, bool]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _recent_rollbacks: int = field(default=0, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.change_history is None:
             self.change_history = []
     
+    def add_change(self, change: Dict[str, Any]) -> None:
+        """Append a change record, keeping the rolling recent-change window in sync"""
+        self.change_history.append(change)
+        if self._recent_changes is not None:
+            rollback = is_rollback(change)
+            self._recent_changes.append((change_epoch(change), rollback))
+            self._recent_rollbacks += rollback
+    
+    def recent_change_counts(self, now: float, window_seconds: float = 24 * 3600) -> Tuple[int, int]:
+        """Return (changes, rollbacks) made within window_seconds before now (epoch)"""
+        recent = self._recent_changes
+        if recent is None:
+            recent = self._recent_changes = deque(sorted(
+                (change_epoch(change), is_rollback(change)) for change in self.change_history
+            ))
+            self._recent_rollbacks = sum(rollback for _, rollback in recent)
+        
+        cutoff = now - window_seconds
+        while recent and recent[0][0] <= cutoff:
+            _, rollback = recent.popleft()
+            self._recent_rollbacks -= rollback
+        return len(recent), self._recent_rollbacks
+    
     @property
     def capacity_tier(self) -> str:
         """Backward compatibility property"""
@@ -175,6 +243,24 @@ class ExperimentController:
         # Data storage
         self.experiment_data_dir = Path("experiment_data")
         self.experiment_data_dir.mkdir(exist_ok=True)
+        
+        # One LND Manage client for the whole run, so pooled keep-alive connections
+        # survive between cycles; opened lazily by _ensure_client, closed by aclose
+        self._client: Optional[LndManageClient] = None
+    
+    async def _ensure_client(self) -> LndManageClient:
+        """Return the shared LND Manage client, opening it on first use"""
+        if self._client is None:
+            client = LndManageClient(self.lnd_manage_url)
+            await client.__aenter__()
+            self._client = client
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the shared LND Manage client, if open"""
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.__aexit__(None, None, None)
     
     async def initialize_experiment(self, duration_days: int = 7) -> bool:
         """Initialize experiment with channel assignments and baseline measurement"""
@@ -182,38 +268,38 @@ class ExperimentController:
         logger.info("Initializing Lightning fee optimization experiment")
         
         # Collect baseline data
-        async with LndManageClient(self.lnd_manage_url) as client:
-            if not await client.is_synced():
-                raise RuntimeError("Node not synced to chain")
-            
-            # Get all channel data
-            channel_data = await client.fetch_all_channel_data()
-            
-            # Analyze channels for experiment assignment
-            analyzer = ChannelAnalyzer(client, self.config)
-            metrics = {}
-            
-            for data in channel_data:
-                try:
-                    from ..models.channel import Channel
-                    if 'timestamp' not in data:
-                        data['timestamp'] = datetime.utcnow().isoformat()
-                    
-                    channel = Channel(**data)
-                    channel_id = channel.channel_id_compact
-                    # Create simplified metrics from channel data  
-                    metrics[channel_id] = {
-                        'capacity': 0,  # Will be filled from channel data
-                        'monthly_flow': 0,
-                        'channel': {
-                            'current_fee_rate': 10,
-                            'peer_pubkey': 'unknown'
-                        }
+        client = await self._ensure_client()
+        if not await client.is_synced():
+            raise RuntimeError("Node not synced to chain")
+        
+        # Get all channel data
+        channel_data = await client.fetch_all_channel_data()
+        
+        # Analyze channels for experiment assignment
+        analyzer = ChannelAnalyzer(client, self.config)
+        metrics = {}
+        
+        for data in channel_data:
+            try:
+                from ..models.channel import Channel
+                if 'timestamp' not in data:
+                    data['timestamp'] = datetime.utcnow().isoformat()
+                
+                channel = Channel(**data)
+                channel_id = channel.channel_id_compact
+                # Create simplified metrics from channel data  
+                metrics[channel_id] = {
+                    'capacity': 0,  # Will be filled from channel data
+                    'monthly_flow': 0,
+                    'channel': {
+                        'current_fee_rate': 10,
+                        'peer_pubkey': 'unknown'
                     }
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to process channel data: {e}")
-                    continue
+                }
+                
+            except Exception as e:
+                logger.warning(f"Failed to process channel data: {e}")
+                continue
         
         # Assign channels to segments based on characteristics
         self._assign_channel_segments(metrics)
@@ -293,15 +379,7 @@ class ExperimentController:
             duration = self.PARAMETER_SET_DURATION_HOURS[param_set]
             if experiment_hours < hours_elapsed + duration:
                 self.current_parameter_set = param_set
-                # Map parameter set to phase for backward compatibility
-                phase_mapping = {
-                    ParameterSet.BASELINE: ExperimentPhase.BASELINE,
-                    ParameterSet.CONSERVATIVE: ExperimentPhase.INITIAL,
-                    ParameterSet.AGGRESSIVE: ExperimentPhase.MODERATE,
-                    ParameterSet.ADVANCED: ExperimentPhase.AGGRESSIVE,
-                    ParameterSet.STABILIZATION: ExperimentPhase.STABILIZATION
-                }
-                self.current_phase = phase_mapping[param_set]
+                self.current_phase = PHASE_BY_PARAMETER_SET[param_set]
                 break
             hours_elapsed += duration
         else:
@@ -328,34 +406,34 @@ class ExperimentController:
     async def _collect_data_point(self, experiment_hours: float) -> None:
         """Collect data point for all channels"""
         
-        async with LndManageClient(self.lnd_manage_url) as client:
-            for channel_id, exp_channel in self.experiment_channels.items():
-                try:
-                    # Get current channel data
-                    channel_details = await client.get_channel_details(channel_id)
-                    
-                    # Create data point
-                    data_point = ExperimentDataPoint(
-                        timestamp=datetime.utcnow(),
-                        experiment_hour=int(experiment_hours),
-                        channel_id=channel_id,
-                        segment=exp_channel.segment,
-                        parameter_set=self.current_parameter_set,
-                        phase=self.current_phase,
-                        outbound_fee_rate=channel_details.get('policies', {}).get('local', {}).get('feeRatePpm', 0),
-                        inbound_fee_rate=channel_details.get('policies', {}).get('local', {}).get('inboundFeeRatePpm', 0),
-                        base_fee_msat=int(channel_details.get('policies', {}).get('local', {}).get('baseFeeMilliSat', '0')),
-                        local_balance_sat=channel_details.get('balance', {}).get('localBalanceSat', 0),
-                        remote_balance_sat=channel_details.get('balance', {}).get('remoteBalanceSat', 0),
-                        forwarded_in_msat=channel_details.get('flowReport', {}).get('forwardedReceivedMilliSat', 0),
-                        forwarded_out_msat=channel_details.get('flowReport', {}).get('forwardedSentMilliSat', 0),
-                        fee_earned_msat=channel_details.get('feeReport', {}).get('earnedMilliSat', 0)
-                    )
-                    
-                    self.data_points.append(data_point)
-                    
-                except Exception as e:
-                    logger.error(f"Failed to collect data for channel {channel_id}: {e}")
+        client = await self._ensure_client()
+        for channel_id, exp_channel in self.experiment_channels.items():
+            try:
+                # Get current channel data
+                channel_details = await client.get_channel_details(channel_id)
+                
+                # Create data point
+                data_point = ExperimentDataPoint(
+                    timestamp=datetime.utcnow(),
+                    experiment_hour=int(experiment_hours),
+                    channel_id=channel_id,
+                    segment=exp_channel.segment,
+                    parameter_set=self.current_parameter_set,
+                    phase=self.current_phase,
+                    outbound_fee_rate=channel_details.get('policies', {}).get('local', {}).get('feeRatePpm', 0),
+                    inbound_fee_rate=channel_details.get('policies', {}).get('local', {}).get('inboundFeeRatePpm', 0),
+                    base_fee_msat=int(channel_details.get('policies', {}).get('local', {}).get('baseFeeMilliSat', '0')),
+                    local_balance_sat=channel_details.get('balance', {}).get('localBalanceSat', 0),
+                    remote_balance_sat=channel_details.get('balance', {}).get('remoteBalanceSat', 0),
+                    forwarded_in_msat=channel_details.get('flowReport', {}).get('forwardedReceivedMilliSat', 0),
+                    forwarded_out_msat=channel_details.get('flowReport', {}).get('forwardedSentMilliSat', 0),
+                    fee_earned_msat=channel_details.get('feeReport', {}).get('earnedMilliSat', 0)
+                )
+                
+                self.data_points.append(data_point)
+                
+            except Exception as e:
+                logger.error(f"Failed to collect data for channel {channel_id}: {e}")
     
     async def _apply_fee_changes(self) -> None:
         """Apply fee changes based on current parameter set to all appropriate channels"""
@@ -375,6 +453,7 @@ class ExperimentController:
                         # Record change with parameter set info
                         change_record = {
                             'timestamp': datetime.utcnow().isoformat(),
+                            'ts_epoch': time.time(),
                             'channel_id': channel_id,
                             'parameter_set': self.current_parameter_set.value,
                             'phase': self.current_phase.value,
@@ -383,9 +462,10 @@ class ExperimentController:
                             'old_inbound': exp_channel.current_inbound_fee,
                             'new_inbound': new_fees['inbound_fee'],
                             'reason': new_fees['reason'],
+                            'is_rollback': False,
                             'success': True
                         }
-                        exp_channel.change_history.append(change_record)
+                        exp_channel.add_change(change_record)
                         
                         # Save to database
                         self.db.save_fee_change(self.experiment_id, change_record)
@@ -617,23 +697,26 @@ class ExperimentController:
         """Determine if channel should have fee change"""
         
         # Check daily change limit
-        today_changes = [
-            change for change in exp_channel.change_history
-            if (datetime.utcnow() - datetime.fromisoformat(change['timestamp'])).days == 0
-        ]
+        now = time.time()
+        today_changes = 0
+        # change_history is chronological: scan from the newest and stop at the window edge
+        for change in reversed(exp_channel.change_history):
+            age = now - change_epoch(change)
+            if age >= 24 * 3600:
+                break
+            today_changes += age >= 0
         
-        if len(today_changes) >= self.MAX_DAILY_CHANGES:
+        if today_changes >= self.MAX_DAILY_CHANGES:
             return False
         
         # Only change twice daily at scheduled times
-        current_hour = datetime.utcnow().hour
+        current_hour = time.gmtime(now).tm_hour
         if current_hour not in [9, 21]:  # 9 AM and 9 PM UTC
             return False
         
         # Check if we changed recently (at least 4 hours gap)
         if exp_channel.change_history:
-            last_change = datetime.fromisoformat(exp_channel.change_history[-1]['timestamp'])
-            if (datetime.utcnow() - last_change).total_seconds() < 4 * 3600:
+            if now - change_epoch(exp_channel.change_history[-1]) < 4 * 3600:
                 return False
         
         return True
@@ -662,14 +745,14 @@ class ExperimentController:
     async def _check_safety_conditions(self) -> None:
         """Check safety conditions and trigger rollbacks if needed"""
         
+        cutoff = datetime.utcnow() - timedelta(hours=4)
         for channel_id, exp_channel in self.experiment_channels.items():
             # All channels are eligible for optimization (no control group)
             
             # Get recent data points
             recent_data = [
                 dp for dp in self.data_points 
-                if dp.channel_id == channel_id and 
-                   (datetime.utcnow() - dp.timestamp).total_seconds() < 4 * 3600
+                if dp.channel_id == channel_id and dp.timestamp > cutoff
             ]
             
             if len(recent_data) < 2:
@@ -716,14 +799,16 @@ class ExperimentController:
             # Record rollback
             rollback_record = {
                 'timestamp': datetime.utcnow().isoformat(),
+                'ts_epoch': time.time(),
                 'phase': self.current_phase.value,
                 'old_fee': exp_channel.current_fee_rate,
                 'new_fee': exp_channel.baseline_fee_rate,
                 'old_inbound': exp_channel.current_inbound_fee,
                 'new_inbound': exp_channel.baseline_inbound_fee,
-                'reason': f'ROLLBACK: {reason}'
+                'reason': f'ROLLBACK: {reason}',
+                'is_rollback': True
             }
-            exp_channel.change_history.append(rollback_record)
+            exp_channel.add_change(rollback_record)
             
             exp_channel.current_fee_rate = exp_channel.baseline_fee_rate
             exp_channel.current_inbound_fee = exp_channel.baseline_inbound_fee
@@ -754,8 +839,9 @@ class ExperimentController:
                     original_metrics=json.loads(ch_data['original_metrics']) if ch_data['original_metrics'] else {}
                 )
                 
-                # Load change history
+                # Load change history (the database returns newest first; keep it chronological)
                 change_history = self.db.get_channel_change_history(ch_data['channel_id'])
+                change_history.reverse()
                 exp_channel.change_history = change_history
                 
                 self.experiment_channels[ch_data['channel_id']] = exp_channel
@@ -844,7 +930,7 @@ class ExperimentController:
         for channel_id, exp_channel in self.experiment_channels.items():
             rollbacks = [
                 change for change in exp_channel.change_history 
-                if 'ROLLBACK' in change['reason']
+                if is_rollback(change)
             ]
             if rollbacks:
                 report['safety_events'].append({
@@ -9,6 +9,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 # SECURITY: Only import SAFE protobuf definitions for fee management
@@ -22,6 +24,16 @@ except ImportError:
     logger.warning("gRPC stubs not available, falling back to REST (secure)")
     GRPC_AVAILABLE = False
 
+# Array layout of forwarding events returned by get_forwarding_events_array
+FORWARDING_EVENT_DTYPE = np.dtype([
+    ('timestamp', np.uint64),
+    ('chan_id_in', np.uint64),
+    ('chan_id_out', np.uint64),
+    ('amt_in_msat', np.uint64),
+    ('amt_out_msat', np.uint64),
+    ('fee_msat', np.uint64),
+])
+
 # 🚨 SECURITY: Whitelist of ALLOWED gRPC methods for fee management ONLY
 ALLOWED_GRPC_METHODS = {
     # Read operations (safe)
@@ -330,6 +342,43 @@ class LNDgRPCClient:
             logger.error(f"Failed to get forwarding history: {e}")
             return []
 
+    def get_forwarding_events_array(self,
+                                    start_time: Optional[int] = None,
+                                    end_time: Optional[int] = None,
+                                    index_offset: int = 0,
+                                    num_max_events: int = 1000) -> np.ndarray:
+        """
+        Get forwarding history as a structured array (see FORWARDING_EVENT_DTYPE)
+
+        Same request as get_forwarding_history, but the protobuf events are copied
+        straight into array columns without building a dict per event.
+
+        Returns:
+            Structured array with one row per forwarding event
+        """
+        _validate_grpc_operation('ForwardingHistory')
+
+        request = ln.ForwardingHistoryRequest(
+            start_time=start_time or 0,
+            end_time=end_time or 0,
+            index_offset=index_offset,
+            num_max_events=num_max_events
+        )
+
+        try:
+            response = self.lightning_stub.ForwardingHistory(request)
+            events = response.forwarding_events
+            return np.fromiter(
+                ((event.timestamp, event.chan_id_in, event.chan_id_out,
+                  event.amt_in_msat, event.amt_out_msat, event.fee_msat)
+                 for event in events),
+                dtype=FORWARDING_EVENT_DTYPE,
+                count=len(events)
+            )
+        except grpc.RpcError as e:
+            logger.error(f"Failed to get forwarding history: {e}")
+            return np.empty(0, dtype=FORWARDING_EVENT_DTYPE)
+
     def subscribe_htlc_events(self):
         """
         Subscribe to HTLC events for real-time opportunity detection
@@ -539,6 +588,13 @@ class AsyncLNDgRPCClient:
             None, lambda: self.sync_client.get_forwarding_history(*args, **kwargs)
         )
 
+    async def get_forwarding_events_array(self, *args, **kwargs):
+        """Async version of get_forwarding_events_array"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None, lambda: self.sync_client.get_forwarding_events_array(*args, **kwargs)
+        )
+
     async def subscribe_htlc_events(self):
         """
         Async generator for HTLC events
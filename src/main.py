@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 """Lightning Fee Optimizer - Main entry point"""
 
-import asyncio
 import click
 import logging
 from pathlib import Path
@@ -12,6 +11,7 @@ from rich.logging import RichHandler
 from .api.client import LndManageClient
 from .analysis.analyzer import ChannelAnalyzer
 from .strategy.optimizer import FeeOptimizer
+from .utils.aio import run_async
 from .utils.config import Config
 
 console = Console()
@@ -50,7 +50,7 @@ def main(
     console.print(f"API URL: {api_url}\n")
     
     try:
-        asyncio.run(run_optimizer(
+        run_async(run_optimizer(
             api_url=api_url,
             config_path=config,
             analyze_only=analyze_only,
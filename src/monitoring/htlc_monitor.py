@@ -3,7 +3,7 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Set, Callable, Protocol
+from typing import Dict, List, Optional, Set, Callable, Protocol, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from collections import defaultdict, deque
@@ -125,6 +125,10 @@ class HTLCMonitor:
         self.events: deque = deque(maxlen=10000)  # Last 10k events
         self.channel_stats: Dict[str, ChannelFailureStats] = {}
 
+        # Bumped whenever events or channel stats change; keys the summary cache
+        self._stats_version = 0
+        self._summary_cache: Optional[Tuple[int, Dict]] = None
+
         # Monitoring state
         self.monitoring = False
         self.monitor_task: Optional[asyncio.Task] = None
@@ -265,6 +269,7 @@ class HTLCMonitor:
         """Process a single HTLC event"""
         # Store event
         self.events.append(event)
+        self._stats_version += 1
 
         # Update channel statistics
         if event.outgoing_channel_id:
@@ -351,8 +356,24 @@ class HTLCMonitor:
                 stats.fee_failures / max(stats.failed_forwards, 1) > 0.3)
         ]
 
+    @property
+    def stats_version(self) -> int:
+        """Counter that changes whenever the tracked events or channel stats change"""
+        return self._stats_version
+
     def get_summary_stats(self) -> Dict:
-        """Get overall monitoring statistics"""
+        """Get overall monitoring statistics
+
+        The event scans are only redone when stats_version has moved since the
+        last call; otherwise the cached summary is returned.
+        """
+        if self._summary_cache is None or self._summary_cache[0] != self._stats_version:
+            self._summary_cache = (self._stats_version, self._compute_summary_stats())
+
+        return {'monitoring_active': self.monitoring, **self._summary_cache[1]}
+
+    def _compute_summary_stats(self) -> Dict:
+        """Scan events and channel stats for the summary counters"""
         total_events = len(self.events)
         total_failures = sum(1 for e in self.events if e.is_failure())
         total_liquidity_failures = sum(1 for e in self.events if e.is_liquidity_failure())
@@ -362,7 +383,6 @@ class HTLCMonitor:
         ) / 1000  # Convert to sats
 
         return {
-            'monitoring_active': self.monitoring,
             'total_events': total_events,
             'total_failures': total_failures,
             'liquidity_failures': total_liquidity_failures,
@@ -377,6 +397,7 @@ class HTLCMonitor:
         cutoff = datetime.now(timezone.utc) - timedelta(hours=self.history_hours)
 
         # Clean old events
+        events_before = len(self.events)
         while self.events and self.events[0].timestamp < cutoff:
             self.events.popleft()
 
@@ -389,6 +410,9 @@ class HTLCMonitor:
                 del self.channel_stats[channel_id]
                 channels_removed += 1
 
+        if channels_removed > 0 or len(self.events) != events_before:
+            self._stats_version += 1
+
         if channels_removed > 0:
             logger.info(f"Cleaned up {channels_removed} inactive channels (cutoff: {cutoff})")
         logger.debug(f"Active channels: {len(self.channel_stats)}")
@@ -1,5 +1,6 @@
 """Advanced Policy-Based Fee Manager - Improved charge-lnd with Inbound Fees"""
 
+import calendar
 import configparser
 import logging
 import re
@@ -551,16 +552,17 @@ class PolicyEngine:
                     'name': rule.name,
                     'applied_count': rule.applied_count,
                     'avg_revenue_impact': avg_revenue_impact,
-                    'last_applied': rule.last_applied.isoformat() if rule.last_applied else None,
+                    # Epoch seconds (UTC) so renderers can format without reparsing
+                    'last_applied': (calendar.timegm(rule.last_applied.utctimetuple())
+                                     if rule.last_applied else None),
                     'strategy': rule.policy.strategy.value
                 })
         
         return report
 
 
-def create_sample_config() -> str:
-    """Create a sample configuration file showcasing improved features"""
-    return """
+# Sample configuration showcasing improved features, encoded once for writers
+SAMPLE_CONFIG = """
 # Improved charge-lnd configuration with advanced inbound fee support
 # This configuration demonstrates the enhanced capabilities over original charge-lnd
 
@@ -650,4 +652,10 @@ strategy = static
 fee_ppm = 1000
 inbound_fee_ppm = 0
 priority = 100
-"""
\ No newline at end of file
+"""
+SAMPLE_CONFIG_BYTES = SAMPLE_CONFIG.encode()
+
+
+def create_sample_config() -> str:
+    """Create a sample configuration file showcasing improved features"""
+    return SAMPLE_CONFIG
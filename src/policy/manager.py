@@ -1,8 +1,11 @@
 """Policy Manager - Integration with existing Lightning fee optimization system"""
 
 import asyncio
+import heapq
 import logging
-from typing import Dict, List, Optional, Any
+import os
+import time
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -14,6 +17,9 @@ from ..experiment.lnd_grpc_client import AsyncLNDgRPCClient
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of rollback updates in flight at once
+ROLLBACK_BATCH_SIZE = 64
+
 
 class PolicyManager:
     """Manages policy-based fee optimization with inbound fee support"""
@@ -27,9 +33,12 @@ class PolicyManager:
                  database_path: str = "experiment_data/policy.db",
                  prefer_grpc: bool = True,
                  max_history_entries: int = 1000,
-                 history_ttl_hours: int = 168):  # 7 days default
+                 history_ttl_hours: int = 168,  # 7 days default
+                 channel_cache_ttl: float = 60.0):
 
+        self.config_file = config_file
         self.policy_engine = PolicyEngine(config_file)
+        self._policy_config_mtime = self._config_mtime()
         self.lnd_manage_url = lnd_manage_url
         self.lnd_rest_url = lnd_rest_url
         self.lnd_grpc_host = lnd_grpc_host
@@ -44,6 +53,20 @@ class PolicyManager:
         self.max_history_entries = max_history_entries
         self.history_ttl_hours = history_ttl_hours
 
+        # Persistent gRPC client, reused across apply/rollback/daemon cycles
+        self._grpc_client: Optional[AsyncLNDgRPCClient] = None
+        self._grpc_client_key = None
+
+        # Shared lnd-manage HTTP session, opened on first use inside the event loop
+        self._lnd_manage: Optional[LndManageClient] = None
+
+        # Channel data cache: channel_id -> (monotonic fetch time, channel_info).
+        # Cached balances and flow stats can be up to channel_cache_ttl seconds old when
+        # rules are matched; channels whose fees change are evicted and refetched. The
+        # daemon sets the TTL from its interval (see lightning_policy.py daemon).
+        self.channel_cache_ttl = channel_cache_ttl
+        self._channel_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
         logger.info(f"Policy manager initialized with {len(self.policy_engine.rules)} rules")
         logger.info(f"Memory management: max {max_history_entries} entries, TTL {history_ttl_hours}h")
     
@@ -59,6 +82,125 @@ class PolicyManager:
         
         logger.info(f"Started policy session {self.policy_session_id}: {session_name}")
         return self.policy_session_id
+
+    def _config_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.config_file).st_mtime
+        except OSError:
+            return None
+
+    def reload_policies_if_changed(self) -> bool:
+        """Reload policy rules if the config file changed on disk, keeping rule statistics"""
+        mtime = self._config_mtime()
+        if mtime is None or mtime == self._policy_config_mtime:
+            return False
+
+        old_engine = self.policy_engine
+        new_engine = PolicyEngine(self.config_file)
+        old_rules = {rule.name: rule for rule in old_engine.rules}
+        for rule in new_engine.rules:
+            old_rule = old_rules.get(rule.name)
+            if old_rule:
+                rule.applied_count = old_rule.applied_count
+                rule.last_applied = old_rule.last_applied
+                rule.revenue_impact = old_rule.revenue_impact
+        new_engine.performance_history = old_engine.performance_history
+
+        self.policy_engine = new_engine
+        self._policy_config_mtime = mtime
+        # Matches depend on the rules, so cached channel state is no longer trusted
+        self._channel_cache.clear()
+        logger.info(f"Policy config changed, reloaded {len(new_engine.rules)} rules")
+        return True
+
+    async def _fetch_channel_data(self, lnd_manage: LndManageClient) -> List[Dict[str, Any]]:
+        """Fetch channel data, reusing entries fetched within channel_cache_ttl seconds"""
+        if self.channel_cache_ttl <= 0:
+            return await lnd_manage.fetch_all_channel_data()
+
+        response = await lnd_manage.get_open_channels()
+        if isinstance(response, dict) and 'channels' in response:
+            channel_ids = response['channels']
+        else:
+            channel_ids = response if isinstance(response, list) else []
+
+        now = time.monotonic()
+        cache = self._channel_cache
+        channel_data = []
+        stale_ids = []
+        for channel_id in channel_ids:
+            entry = cache.get(channel_id)
+            if entry is not None and now - entry[0] < self.channel_cache_ttl:
+                channel_data.append(entry[1])
+            else:
+                stale_ids.append(channel_id)
+        cache_hits = len(channel_data)
+
+        if stale_ids:
+            fetched = await lnd_manage.fetch_all_channel_data(stale_ids)
+            for channel_info in fetched:
+                channel_id = channel_info.get('channelIdCompact')
+                # Only cache complete responses; partial fallbacks are refetched next time
+                if channel_id and channel_info.get('channelPoint'):
+                    cache[channel_id] = (now, channel_info)
+            channel_data.extend(fetched)
+
+        # Forget channels that are no longer open
+        if len(cache) > len(channel_ids):
+            open_ids = set(channel_ids)
+            for channel_id in [cid for cid in cache if cid not in open_ids]:
+                del cache[channel_id]
+
+        logger.debug(f"Channel cache: {cache_hits} hits, {len(stale_ids)} fetched")
+        return channel_data
+
+    async def get_lnd_manage_client(self) -> LndManageClient:
+        """Return the shared lnd-manage client, opening its connection pool on first use"""
+        if self._lnd_manage is None:
+            client = LndManageClient(self.lnd_manage_url)
+            await client.__aenter__()
+            self._lnd_manage = client
+        return self._lnd_manage
+
+    async def close(self) -> None:
+        """Close the shared lnd-manage session and the cached gRPC channel"""
+        if self._lnd_manage is not None:
+            client, self._lnd_manage = self._lnd_manage, None
+            await client.__aexit__(None, None, None)
+        self.close_grpc_client()
+
+    def get_grpc_client(self, macaroon_path: str = None,
+                        cert_path: str = None) -> Optional[AsyncLNDgRPCClient]:
+        """Return a cached gRPC client, or None if gRPC is not preferred or unavailable"""
+        if not self.prefer_grpc:
+            return None
+
+        key = (macaroon_path, cert_path)
+        if self._grpc_client is not None and self._grpc_client_key == key:
+            return self._grpc_client
+
+        self.close_grpc_client()
+        try:
+            self._grpc_client = AsyncLNDgRPCClient(
+                lnd_dir=self.lnd_dir,
+                server=self.lnd_grpc_host,
+                macaroon_path=macaroon_path,
+                tls_cert_path=cert_path
+            )
+            self._grpc_client_key = key
+            logger.info(f"Connected to LND via gRPC at {self.lnd_grpc_host}")
+        except Exception as e:
+            logger.warning(f"Failed to connect via gRPC: {e}, falling back to REST")
+            self._grpc_client = None
+            self._grpc_client_key = None
+        return self._grpc_client
+
+    def close_grpc_client(self) -> None:
+        """Close the cached gRPC channel, if any"""
+        if self._grpc_client is not None:
+            self._grpc_client.sync_client.close()
+            self._grpc_client = None
+            self._grpc_client_key = None
     
     async def apply_policies(self, dry_run: bool = False,
                            macaroon_path: str = None,
@@ -78,29 +220,18 @@ class PolicyManager:
         }
         
         # Get all channel data
-        async with LndManageClient(self.lnd_manage_url) as lnd_manage:
-            channel_data = await lnd_manage.fetch_all_channel_data()
+        lnd_manage = await self.get_lnd_manage_client()
+        channel_data = await self._fetch_channel_data(lnd_manage)
         
         # Initialize LND client (prefer gRPC, fallback to REST)
         lnd_client = None
         client_type = "unknown"
         
         if not dry_run:
-            # Try gRPC first if preferred
-            if self.prefer_grpc:
-                try:
-                    lnd_client = AsyncLNDgRPCClient(
-                        lnd_dir=self.lnd_dir,
-                        server=self.lnd_grpc_host,
-                        macaroon_path=macaroon_path,
-                        tls_cert_path=cert_path
-                    )
-                    await lnd_client.__aenter__()
-                    client_type = "gRPC"
-                    logger.info(f"Connected to LND via gRPC at {self.lnd_grpc_host}")
-                except Exception as e:
-                    logger.warning(f"Failed to connect via gRPC: {e}, falling back to REST")
-                    lnd_client = None
+            # Reuse the persistent gRPC client if preferred
+            lnd_client = self.get_grpc_client(macaroon_path, cert_path)
+            if lnd_client is not None:
+                client_type = "gRPC"
             
             # Fallback to REST if gRPC failed or not preferred
             if lnd_client is None:
@@ -167,6 +298,8 @@ class PolicyManager:
                             
                             if success:
                                 results['fee_changes'] += 1
+                                # Cached state no longer reflects the channel's fees
+                                self._channel_cache.pop(channel_id, None)
                                 
                                 # Record change in database
                                 change_record = {
@@ -221,7 +354,8 @@ class PolicyManager:
                     results['errors'].append(error_msg)
         
         finally:
-            if lnd_client:
+            # The gRPC client is cached on the manager; only tear down REST sessions
+            if lnd_client and client_type == "REST":
                 await lnd_client.__aexit__(None, None, None)
         
         # Generate performance summary
@@ -265,13 +399,13 @@ class PolicyManager:
 
         # If still over limit, remove oldest entries
         if len(self.last_fee_changes) > self.max_history_entries:
-            # Sort by timestamp and keep only the most recent max_history_entries
-            sorted_changes = sorted(
+            # Keep only the most recent max_history_entries without sorting everything
+            recent_changes = heapq.nlargest(
+                self.max_history_entries,
                 self.last_fee_changes.items(),
-                key=lambda x: x[1]['timestamp'],
-                reverse=True
+                key=lambda x: x[1]['timestamp']
             )
-            self.last_fee_changes = dict(sorted_changes[:self.max_history_entries])
+            self.last_fee_changes = dict(recent_changes)
 
         # Cleanup rollback_candidates with similar logic
         expired_candidates = [
@@ -282,12 +416,12 @@ class PolicyManager:
             del self.rollback_candidates[channel_id]
 
         if len(self.rollback_candidates) > self.max_history_entries:
-            sorted_candidates = sorted(
+            recent_candidates = heapq.nlargest(
+                self.max_history_entries,
                 self.rollback_candidates.items(),
-                key=lambda x: x[1],
-                reverse=True
+                key=lambda x: x[1]
             )
-            self.rollback_candidates = dict(sorted_candidates[:self.max_history_entries])
+            self.rollback_candidates = dict(recent_candidates)
 
         cleaned_count = initial_count - len(self.last_fee_changes)
         if cleaned_count > 0:
@@ -497,8 +631,8 @@ class PolicyManager:
         }
     
     async def execute_rollbacks(self, rollback_actions: List[Dict],
-                              lnd_rest: LNDRestClient = None) -> Dict[str, Any]:
-        """Execute rollbacks for underperforming channels"""
+                              lnd_client=None) -> Dict[str, Any]:
+        """Execute rollbacks for underperforming channels (gRPC or REST client)"""
         
         results = {
             'rollbacks_attempted': 0,
@@ -506,49 +640,48 @@ class PolicyManager:
             'errors': []
         }
         
-        for action in rollback_actions:
+        async def _rollback(action: Dict, lnd_manage: Optional[LndManageClient]) -> None:
             channel_id = action['channel_id']
             
             try:
                 # Apply rollback
-                if lnd_rest:
+                if lnd_client:
                     # Get channel info for chan_point
-                    async with LndManageClient(self.lnd_manage_url) as lnd_manage:
-                        channel_details = await lnd_manage.get_channel_details(channel_id)
-                        chan_point = channel_details.get('channelPoint')
+                    channel_details = await lnd_manage.get_channel_details(channel_id)
+                    chan_point = channel_details.get('channelPoint')
+                    
+                    if chan_point:
+                        await lnd_client.update_channel_policy(
+                            chan_point=chan_point,
+                            fee_rate_ppm=action['old_outbound'],
+                            inbound_fee_rate_ppm=action['old_inbound'],
+                            base_fee_msat=0,
+                            time_lock_delta=80
+                        )
                         
-                        if chan_point:
-                            await lnd_rest.update_channel_policy(
-                                chan_point=chan_point,
-                                fee_rate_ppm=action['old_outbound'],
-                                inbound_fee_rate_ppm=action['old_inbound'],
-                                base_fee_msat=0,
-                                time_lock_delta=80
-                            )
-                            
-                            results['rollbacks_successful'] += 1
-                            
-                            # Record rollback
-                            rollback_record = {
-                                'timestamp': datetime.utcnow().isoformat(),
-                                'channel_id': channel_id,
-                                'parameter_set': 'policy_rollback',
-                                'phase': 'rollback',
-                                'old_fee': action['new_outbound'],
-                                'new_fee': action['old_outbound'],
-                                'old_inbound': action['new_inbound'],
-                                'new_inbound': action['old_inbound'],
-                                'reason': f"ROLLBACK: Revenue declined {action['revenue_decline']:.1%}",
-                                'success': True
-                            }
-                            
-                            self.db.save_fee_change(self.policy_session_id, rollback_record)
-                            
-                            # Remove from tracking
-                            if channel_id in self.last_fee_changes:
-                                del self.last_fee_changes[channel_id]
-                            
-                            logger.info(f"Rolled back channel {channel_id} due to {action['revenue_decline']:.1%} revenue decline")
+                        results['rollbacks_successful'] += 1
+                        
+                        # Record rollback
+                        rollback_record = {
+                            'timestamp': datetime.utcnow().isoformat(),
+                            'channel_id': channel_id,
+                            'parameter_set': 'policy_rollback',
+                            'phase': 'rollback',
+                            'old_fee': action['new_outbound'],
+                            'new_fee': action['old_outbound'],
+                            'old_inbound': action['new_inbound'],
+                            'new_inbound': action['old_inbound'],
+                            'reason': f"ROLLBACK: Revenue declined {action['revenue_decline']:.1%}",
+                            'success': True
+                        }
+                        
+                        self.db.save_fee_change(self.policy_session_id, rollback_record)
+                        
+                        # Remove from tracking
+                        self.last_fee_changes.pop(channel_id, None)
+                        self._channel_cache.pop(channel_id, None)
+                        
+                        logger.info(f"Rolled back channel {channel_id} due to {action['revenue_decline']:.1%} revenue decline")
                 
                 results['rollbacks_attempted'] += 1
                 
@@ -557,6 +690,17 @@ class PolicyManager:
                 logger.error(error_msg)
                 results['errors'].append(error_msg)
         
+        async def _run_batches(lnd_manage: Optional[LndManageClient]) -> None:
+            # Issue updates concurrently in bounded batches over one shared session
+            for i in range(0, len(rollback_actions), ROLLBACK_BATCH_SIZE):
+                batch = rollback_actions[i:i + ROLLBACK_BATCH_SIZE]
+                await asyncio.gather(*(_rollback(action, lnd_manage) for action in batch))
+        
+        if lnd_client and rollback_actions:
+            await _run_batches(await self.get_lnd_manage_client())
+        else:
+            await _run_batches(None)
+        
         return results
     
     def get_policy_status(self) -> Dict[str, Any]:
@@ -577,11 +721,8 @@ class PolicyManager:
     
     def save_config_template(self, filepath: str) -> None:
         """Save a sample configuration file"""
-        from .engine import create_sample_config
-        
-        sample_config = create_sample_config()
+        from .engine import SAMPLE_CONFIG_BYTES
         
-        with open(filepath, 'w') as f:
-            f.write(sample_config)
+        Path(filepath).write_bytes(SAMPLE_CONFIG_BYTES)
         
         logger.info(f"Sample configuration saved to {filepath}")
\ No newline at end of file
@@ -0,0 +1,16 @@
+"""Event loop helpers shared by the command-line entry points"""
+
+import asyncio
+
+try:
+    import uvloop  # not available on Windows
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+
+def run_async(coro):
+    """Run a command's coroutine on uvloop when installed, else the default event loop"""
+    if UVLOOP_AVAILABLE:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
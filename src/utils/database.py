@@ -319,6 +319,26 @@ class ExperimentDatabase:
             row = cursor.fetchone()
             return dict(row) if row else {}
     
+    def get_all_parameter_set_performance(self, experiment_id: int) -> Dict[str, Dict[str, Any]]:
+        """Get performance summaries for every parameter set in one query, keyed by parameter set"""
+        with self._get_connection() as conn:
+            cursor = conn.execute("""
+                SELECT 
+                    parameter_set,
+                    COUNT(DISTINCT channel_id) as channels,
+                    AVG(fee_earned_msat) as avg_revenue,
+                    AVG(flow_efficiency) as avg_flow_efficiency,
+                    AVG(balance_health_score) as avg_balance_health,
+                    SUM(fee_earned_msat) as total_revenue,
+                    MIN(timestamp) as start_time,
+                    MAX(timestamp) as end_time
+                FROM data_points 
+                WHERE experiment_id = ?
+                GROUP BY parameter_set
+            """, (experiment_id,))
+            
+            return {row['parameter_set']: dict(row) for row in cursor.fetchall()}
+    
     def get_experiment_summary(self, experiment_id: int) -> Dict[str, Any]:
         """Get comprehensive experiment summary"""
         with self._get_connection() as conn:
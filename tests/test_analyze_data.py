@@ -0,0 +1,42 @@
+"""Tests for analyze_data helpers"""
+
+import numpy as np
+import pandas as pd
+
+from analyze_data import _top_k, analyze_channels
+
+
+def test_top_k_matches_nlargest_on_ties():
+    """_top_k picks the same rows, in the same order, as DataFrame.nlargest"""
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        n = int(rng.integers(1, 40))
+        # Few distinct values so the k-th boundary is almost always tied
+        df = pd.DataFrame({'v': rng.integers(0, 5, n)}, index=rng.permutation(n) * 3)
+        pd.testing.assert_frame_equal(_top_k(df, 'v'), df.nlargest(10, 'v'))
+
+
+def test_top_k_matches_nlargest_with_nan():
+    """NaN rows are skipped or appended exactly like DataFrame.nlargest does"""
+    rng = np.random.default_rng(1)
+    for _ in range(500):
+        n = int(rng.integers(1, 40))
+        values = rng.integers(0, 5, n).astype(float)
+        values[rng.random(n) < 0.3] = np.nan
+        df = pd.DataFrame({'v': values})
+        pd.testing.assert_frame_equal(_top_k(df, 'v'), df.nlargest(10, 'v'))
+
+
+def test_analyze_channels_handles_null_and_large_fields():
+    """Null numeric fields read as missing; fee rates above 2**31 do not overflow"""
+    channels = [
+        {'channelIdCompact': 'a', 'capacitySat': '1000000',
+         'policies': {'local': {'feeRatePpm': 2**32 - 1}, 'remote': {'feeRatePpm': None}},
+         'rating': {'rating': None}, 'numUpdates': None},
+        {'channelIdCompact': 'b'},
+    ]
+    df = analyze_channels(channels)
+    assert df['local_fee_rate'].tolist() == [2**32 - 1, 0]
+    assert df['remote_fee_rate'].tolist() == [0, 0]
+    assert df['rating'].tolist() == [-1, -1]
+    assert df['num_updates'].tolist() == [0, 0]